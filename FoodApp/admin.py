@@ -1,21 +1,166 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
 from .models import FoodCategory, OptionGroups, Product, OrderItems, Order, Restaurant, User, Address, RestaurantCategory, RestaurantReview, Options, OrderItemOptions
 
 ## fixos
 from .models import Roles, OrderStatus
 
+ESTIMATE_ABOVE = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use the planner's row estimate for unfiltered changelists of huge tables."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = self.estimate(queryset)
+            if estimate is not None and estimate > ESTIMATE_ABOVE:
+                return estimate
+        return super().count
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == "postgresql":
+                    cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+                elif connection.vendor == "sqlite":
+                    # Filled by ANALYZE / PRAGMA optimize; the first number of each row is
+                    # the number of entries in that index. A partial index holds fewer
+                    # than the table, so take the largest.
+                    cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+                else:
+                    return None
+                rows = cursor.fetchall()
+        except DatabaseError:
+            return None
+        counts = [int(str(stat).split()[0]) for stat, in rows if stat]
+        return max(counts) if counts else None
+
+
+class FoodAppAdmin(admin.ModelAdmin):
+    ordering = ("-pk",)
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Also covers autocomplete results and FK columns rendered through __str__.
+        queryset = super().get_queryset(request)
+        if isinstance(self.list_select_related, (list, tuple)) and self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        return queryset
+
+
+class LargeTableAdmin(FoodAppAdmin):
+    paginator = EstimatedCountPaginator
+
+
 ## Register your models here.
-admin.site.register(User)
-admin.site.register(Restaurant)
-admin.site.register(Address)
-admin.site.register(RestaurantReview)
-admin.site.register(Order)
-admin.site.register(Product)
-admin.site.register(OptionGroups)
-admin.site.register(Options)
-admin.site.register(OrderItems)
-admin.site.register(OrderItemOptions)
-admin.site.register(FoodCategory)
-admin.site.register(RestaurantCategory)
-admin.site.register(Roles)
-admin.site.register(OrderStatus)
\ No newline at end of file
+@admin.register(User)
+class UserAdmin(LargeTableAdmin):
+    list_display = ("id", "username", "email", "role", "is_active", "created_at")
+    list_filter = ("is_active", "role")
+    list_select_related = ("role",)
+    search_fields = ("username", "email", "cpf")
+
+
+@admin.register(Restaurant)
+class RestaurantAdmin(FoodAppAdmin):
+    list_display = ("id", "name", "cnpj", "owner_id", "rating_avg", "rating_count", "created_at")
+    list_select_related = ("owner_id",)
+    search_fields = ("name", "cnpj")
+    autocomplete_fields = ("owner_id",)
+    # Maintained by services.ratings; Restaurant.save() never writes them back.
+    readonly_fields = Restaurant.RATING_FIELDS
+
+
+@admin.register(Address)
+class AddressAdmin(LargeTableAdmin):
+    list_display = ("id", "street", "number", "city", "state", "user_id", "restaurant_id")
+    list_select_related = ("user_id", "restaurant_id")
+    search_fields = ("street", "city", "zip_code")
+    autocomplete_fields = ("user_id", "restaurant_id")
+
+
+@admin.register(RestaurantReview)
+class RestaurantReviewAdmin(LargeTableAdmin):
+    list_display = ("id", "restaurant_id", "user_id", "rating", "created_at")
+    list_filter = ("rating",)
+    list_select_related = ("restaurant_id", "user_id")
+    autocomplete_fields = ("restaurant_id", "user_id")
+
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdmin):
+    list_display = ("id", "user_id", "restaurant_id", "status", "total_price", "created_at")
+    list_filter = ("status",)
+    list_select_related = ("user_id", "restaurant_id", "status")
+    autocomplete_fields = ("user_id", "restaurant_id")
+
+
+@admin.register(Product)
+class ProductAdmin(FoodAppAdmin):
+    list_display = ("id", "name", "restaurant_id", "base_price")
+    list_select_related = ("restaurant_id",)
+    search_fields = ("name",)
+    autocomplete_fields = ("restaurant_id",)
+
+
+@admin.register(OptionGroups)
+class OptionGroupsAdmin(FoodAppAdmin):
+    list_display = ("id", "name", "product_id", "is_required", "min_selection", "max_selection")
+    list_select_related = ("product_id__restaurant_id",)
+    search_fields = ("name",)
+    autocomplete_fields = ("product_id",)
+
+
+@admin.register(Options)
+class OptionsAdmin(FoodAppAdmin):
+    list_display = ("id", "name", "option_group_id", "extra_price")
+    list_select_related = ("option_group_id__product_id",)
+    search_fields = ("name",)
+    autocomplete_fields = ("option_group_id",)
+
+
+@admin.register(OrderItems)
+class OrderItemsAdmin(LargeTableAdmin):
+    list_display = ("id", "order_id", "product_id", "quantity", "base_price")
+    list_select_related = ("order_id", "product_id__restaurant_id")
+    raw_id_fields = ("order_id",)
+    autocomplete_fields = ("product_id",)
+
+
+@admin.register(OrderItemOptions)
+class OrderItemOptionsAdmin(LargeTableAdmin):
+    list_display = ("id", "order_item_id", "option_id")
+    list_select_related = ("order_item_id__product_id", "option_id__option_group_id")
+    raw_id_fields = ("order_item_id",)
+    autocomplete_fields = ("option_id",)
+
+
+@admin.register(FoodCategory)
+class FoodCategoryAdmin(FoodAppAdmin):
+    list_display = ("id", "name")
+    search_fields = ("name",)
+
+
+@admin.register(RestaurantCategory)
+class RestaurantCategoryAdmin(FoodAppAdmin):
+    list_display = ("id", "restaurant_id", "food_category_id")
+    list_select_related = ("restaurant_id", "food_category_id")
+    autocomplete_fields = ("restaurant_id", "food_category_id")
+
+
+@admin.register(Roles)
+class RolesAdmin(FoodAppAdmin):
+    list_display = ("id", "name")
+
+
+@admin.register(OrderStatus)
+class OrderStatusAdmin(FoodAppAdmin):
+    list_display = ("id", "name")
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class FoodappConfig(AppConfig):
     name = 'FoodApp'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from FoodApp.models import Order
+from FoodApp.services.archive import archive_batch, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Move orders older than ORDER_ARCHIVE_AFTER_DAYS (with their items and options) into the "
+        "archive tables, oldest first, in small transactions with a pause in between so live "
+        "traffic is never blocked for long. Safe to interrupt and re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+            help="Archive orders created more than this many days ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Orders per transaction.")
+        parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches.")
+        parser.add_argument("--max-batches", type=int, help="Stop after this many batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived.")
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(options["days"])
+        if options["dry_run"]:
+            pending = Order.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"{pending} pedidos criados antes de {cutoff:%Y-%m-%d %H:%M} seriam arquivados.")
+            return
+
+        started = time.perf_counter()
+        total = batches = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            moved = archive_batch(cutoff, options["batch_size"])
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  batch {batches}: {moved} orders")
+            time.sleep(options["pause"])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {total} orders created before {cutoff:%Y-%m-%d %H:%M} "
+                f"in {batches} batches ({elapsed:.1f}s)."
+            )
+        )
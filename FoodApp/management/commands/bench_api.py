@@ -0,0 +1,315 @@
+import http.client
+import json
+import platform
+import random
+import re
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from FoodApp.models import FoodCategory, OptionGroups, Options, Product, Restaurant, User
+
+SAMPLE_SIZE = 500
+SEARCH_TERMS = ["pizza", "burger", "sushi", "acai", "pastel", "feijoada", "coxinha", "padaria"]
+
+
+def sample_ids(queryset, rng):
+    ids = list(queryset.values_list("id", flat=True)[:SAMPLE_SIZE * 4])
+    return rng.sample(ids, min(len(ids), SAMPLE_SIZE))
+
+
+class Fixtures:
+    def __init__(self, rng):
+        self.rng = rng
+        self.users = sample_ids(User.objects.filter(is_active=True).order_by("-id"), rng)
+        self.restaurants = sample_ids(Restaurant.objects.order_by("-id"), rng)
+        self.categories = sample_ids(FoodCategory.objects.order_by("id"), rng)
+        self._orders = None
+
+    def pick(self, name):
+        values = getattr(self, name)
+        if not values:
+            raise CommandError(f"Sem dados para o cenário ({name}); rode seed_data antes.")
+        return self.rng.choice(values)
+
+    def order_payload(self):
+        if self._orders is None:
+            self._orders = []
+            products = Product.objects.filter(restaurant_id__in=self.restaurants[:50]).values(
+                "id", "restaurant_id"
+            )
+            groups = {}
+            for group in OptionGroups.objects.filter(
+                product_id__in=[product["id"] for product in products], is_required=True
+            ).values("id", "product_id"):
+                groups.setdefault(group["product_id"], []).append(group["id"])
+            first_option = {}
+            for option in Options.objects.filter(
+                option_group_id__in=[group for ids in groups.values() for group in ids]
+            ).order_by("id").values("id", "option_group_id"):
+                first_option.setdefault(option["option_group_id"], option["id"])
+            for product in products:
+                options = [first_option.get(group) for group in groups.get(product["id"], [])]
+                if None not in options:
+                    self._orders.append((product["restaurant_id"], product["id"], options))
+        if not self._orders:
+            raise CommandError("Sem produtos para o cenário place_order; rode seed_data antes.")
+        restaurant_id, product_id, options = self.rng.choice(self._orders)
+        return {
+            "user_id": self.pick("users"),
+            "restaurant_id": restaurant_id,
+            "items": [{"product_id": product_id, "quantity": 1, "options": options}],
+        }
+
+
+SCENARIOS = {
+    "user_detail": lambda f: ("get", f"/user/{f.pick('users')}", None),
+    "user_orders": lambda f: ("get", f"/user/{f.pick('users')}/orders", None),
+    "restaurant_list": lambda f: ("get", "/restaurants?ordering=rating", None),
+    "restaurant_nearby": lambda f: (
+        "get",
+        f"/restaurants/nearby?lat={-23.55 + f.rng.uniform(-0.1, 0.1):.5f}"
+        f"&lng={-46.63 + f.rng.uniform(-0.1, 0.1):.5f}&radius=3",
+        None,
+    ),
+    "restaurant_menu": lambda f: ("get", f"/restaurants/{f.pick('restaurants')}/menu", None),
+    "restaurant_reviews": lambda f: ("get", f"/restaurants/{f.pick('restaurants')}/reviews", None),
+    "restaurant_orders": lambda f: ("get", f"/restaurants/{f.pick('restaurants')}/orders", None),
+    "restaurant_analytics": lambda f: ("get", f"/restaurants/{f.pick('restaurants')}/analytics", None),
+    "search": lambda f: ("get", f"/search?q={f.rng.choice(SEARCH_TERMS)}", None),
+    "categories": lambda f: ("get", "/categories", None),
+    "category_restaurants": lambda f: ("get", f"/categories/{f.pick('categories')}/restaurants", None),
+    "place_order": lambda f: ("post", "/orders", f.order_payload()),
+}
+WRITE_SCENARIOS = {"place_order"}
+COMPARED = (("throughput_rps", 1), ("p50_ms", -1), ("p95_ms", -1), ("p99_ms", -1), ("queries_per_request", -1))
+# RequestMetricsMiddleware reports the query count in Server-Timing.
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+class ClientTarget:
+    """In-process through the test client (one per worker thread); counts queries directly."""
+
+    name = "in-process"
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def send(self, method, path, body):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = Client()
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(db)) for db in connections.all()]
+            begin = time.perf_counter()
+            if body is None:
+                response = getattr(client, method)(path)
+            else:
+                response = getattr(client, method)(path, body, content_type="application/json")
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+            latency = time.perf_counter() - begin
+        return latency, response.status_code, sum(len(context) for context in captured)
+
+    def close(self):
+        # Worker threads open their own database connections.
+        connections.close_all()
+
+
+class HttpTarget:
+    """A running server (``--url``), one keep-alive connection per worker thread."""
+
+    def __init__(self, url):
+        url = urlsplit(url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise CommandError("Use uma URL http(s)://host:porta")
+        self.name = url.geturl()
+        self.scheme, self.host, self.port = url.scheme, url.hostname, url.port
+        self.prefix = url.path.rstrip("/")
+        self.local = threading.local()
+
+    def connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = self.local.connection = factory(self.host, self.port, timeout=30)
+        return connection
+
+    def send(self, method, path, body):
+        payload = None if body is None else json.dumps(body).encode()
+        headers = {} if payload is None else {"Content-Type": "application/json"}
+        begin = time.perf_counter()
+        try:
+            connection = self.connection()
+            connection.request(method.upper(), self.prefix + path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.local.connection.close()
+            self.local.connection = None
+            return time.perf_counter() - begin, 0, None
+        latency = time.perf_counter() - begin
+        match = SERVER_TIMING_QUERIES.search(response.getheader("Server-Timing") or "")
+        return latency, response.status, int(match.group(1)) if match else None
+
+    def close(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Run scripted API scenarios and report throughput, p50/p95/p99 latency and queries per "
+        "request. By default requests go in-process through the test client; with --url they go "
+        "over HTTP to a running server (e.g. gunicorn or uvicorn on the same database), from "
+        "--concurrency worker threads. Results can be saved as JSON and compared with a previous "
+        "run. Seed the database with seed_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario", action="append", choices=sorted(SCENARIOS),
+            help="Scenario to run (repeatable). Defaults to every read scenario.",
+        )
+        parser.add_argument("--writes", action="store_true", help="Also run the write scenarios.")
+        parser.add_argument(
+            "--url", help="Base URL of a running server, e.g. http://127.0.0.1:8000. Default: in-process.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=1, help="Worker threads sending requests at once.",
+        )
+        parser.add_argument("--requests", type=int, default=300)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Previous results JSON to compare against.")
+        parser.add_argument(
+            "--threshold", type=float, default=10.0,
+            help="Percent change that counts as a regression when comparing.",
+        )
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        names = options["scenario"] or [
+            name for name in SCENARIOS if options["writes"] or name not in WRITE_SCENARIOS
+        ]
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency deve ser >= 1")
+        fixtures = Fixtures(random.Random(options["seed"]))
+        target = HttpTarget(options["url"]) if options["url"] else ClientTarget()
+
+        results = {}
+        for name in names:
+            results[name] = self.run_scenario(target, fixtures, name, options)
+            row = results[name]
+            queries = row["queries_per_request"]
+            self.stdout.write(
+                f"{name:22} {row['throughput_rps']:8.1f} req/s  p50={row['p50_ms']:.2f} "
+                f"p95={row['p95_ms']:.2f} p99={row['p99_ms']:.2f} ms  "
+                f"queries={'-' if queries is None else f'{queries:.1f}'}  errors={row['errors']}"
+            )
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "target": target.name,
+                "concurrency": options["concurrency"],
+                "requests": options["requests"],
+                "seed": options["seed"],
+            },
+            "scenarios": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"results written to {options['output']}")
+        if options["compare"]:
+            regressions = self.compare(report, options["compare"], options["threshold"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{regressions} regression(s) above {options['threshold']}%.")
+
+    def run_scenario(self, target, fixtures, name, options):
+        # Requests are drawn up front so worker threads never share the fixtures' RNG.
+        scenario = SCENARIOS[name]
+        calls = [scenario(fixtures) for _ in range(options["warmup"] + options["requests"])]
+        warmup, calls = calls[:options["warmup"]], calls[options["warmup"]:]
+
+        def send_all(batch):
+            try:
+                return [target.send(*call) for call in batch]
+            finally:
+                target.close()
+
+        for call in warmup:
+            target.send(*call)
+        workers = min(options["concurrency"], len(calls))
+        started = time.perf_counter()
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                batches = pool.map(send_all, [calls[index::workers] for index in range(workers)])
+                samples = [sample for batch in batches for sample in batch]
+        else:
+            samples = [target.send(*call) for call in calls]
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency for latency, _, _ in samples]
+        errors = sum(1 for _, status_code, _ in samples if not status_code or status_code >= 400)
+        queries = [count for _, _, count in samples if count is not None]
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+            "p50_ms": round(quantiles[49] * 1000, 3),
+            "p95_ms": round(quantiles[94] * 1000, 3),
+            "p99_ms": round(quantiles[98] * 1000, 3),
+            "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+            "max_queries": max(queries) if queries else None,
+        }
+
+    def compare(self, report, path, threshold):
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+        self.stdout.write(f"\ncompared with {path} (commit {baseline['meta'].get('commit')})")
+        regressions = 0
+        for name, row in report["scenarios"].items():
+            previous = baseline["scenarios"].get(name)
+            if previous is None:
+                continue
+            changes = []
+            for metric, direction in COMPARED:
+                before, after = previous.get(metric), row[metric]
+                if not before or after is None:
+                    continue
+                delta = (after - before) / before * 100
+                worse = delta * direction < -threshold
+                regressions += worse
+                changes.append(f"{metric} {delta:+.1f}%{' !' if worse else ''}")
+            self.stdout.write(f"{name:22} " + "  ".join(changes))
+        return regressions
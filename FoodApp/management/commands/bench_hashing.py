@@ -0,0 +1,35 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Benchmark password hashing throughput (signups/second) per core and per worker pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hashes", type=int, default=50)
+        parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        total = options["hashes"]
+        threads = options["threads"]
+        hasher = get_hasher()
+
+        started = time.perf_counter()
+        for index in range(total):
+            make_password(f"senha{index:04d}")
+        serial = total / (time.perf_counter() - started)
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            started = time.perf_counter()
+            list(pool.map(make_password, (f"senha{index:04d}" for index in range(total))))
+            pooled = total / (time.perf_counter() - started)
+
+        self.stdout.write(f"hasher: {hasher.algorithm} ({settings.PASSWORD_HASHER})")
+        self.stdout.write(f"cpus: {os.cpu_count()}, pool threads: {threads}")
+        self.stdout.write(f"single core: {serial:.1f} signups/s ({1000 / serial:.1f} ms per hash)")
+        self.stdout.write(f"pool: {pooled:.1f} signups/s ({pooled / serial:.2f}x single core)")
@@ -0,0 +1,92 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from FoodApp.models import (
+    Options,
+    OptionGroups,
+    OrderStatus,
+    Product,
+    Restaurant,
+    User,
+)
+from FoodApp.serializers.order_serializers import CreateOrderSerializer
+
+
+class Command(BaseCommand):
+    help = "Benchmark order placement (orders/second) against the configured database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=500)
+        parser.add_argument("--items", type=int, default=20)
+        parser.add_argument("--keep", action="store_true", help="Keep the generated rows.")
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        OrderStatus.objects.get_or_create(name="Pending")
+        owner = User.objects.create(
+            username=f"bench_owner_{tag}", phone="11999999999",
+            email=f"owner-{tag}@bench.local", password_hash="!",
+        )
+        customer = User.objects.create(
+            username=f"bench_customer_{tag}", phone="11999999999",
+            email=f"customer-{tag}@bench.local", password_hash="!",
+        )
+        restaurant = Restaurant.objects.create(name=f"Bench {tag}", owner_id=owner, cnpj=f"bench-{tag}")
+
+        items = []
+        for index in range(options["items"]):
+            product = Product.objects.create(
+                restaurant_id=restaurant, name=f"Produto {index}", base_price="19.90"
+            )
+            size = OptionGroups.objects.create(
+                product_id=product, name="Tamanho", is_required=True, min_selection=1, max_selection=1
+            )
+            extras = OptionGroups.objects.create(
+                product_id=product, name="Adicionais", min_selection=0, max_selection=2
+            )
+            size_options = Options.objects.bulk_create(
+                [Options(option_group_id=size, name=name, extra_price="0.00") for name in ("P", "M", "G")]
+            )
+            extra_options = Options.objects.bulk_create(
+                [Options(option_group_id=extras, name=name, extra_price="2.50") for name in ("Queijo", "Bacon", "Ovo")]
+            )
+            items.append({
+                "product_id": product.id,
+                "quantity": 1 + index % 3,
+                "options": [size_options[1].id, extra_options[0].id, extra_options[1].id],
+            })
+        payload = {"user_id": customer.id, "restaurant_id": restaurant.id, "items": items}
+
+        def place():
+            serializer = CreateOrderSerializer(data=payload)
+            serializer.is_valid(raise_exception=True)
+            return serializer.save()
+
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                place()
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(options["orders"]):
+                begin = time.perf_counter()
+                place()
+                latencies.append(time.perf_counter() - begin)
+            elapsed = time.perf_counter() - started
+        finally:
+            if not options["keep"]:
+                restaurant.delete()
+                User.objects.filter(id__in=[owner.id, customer.id]).delete()
+
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(f"database: {connection.vendor} ({connection.settings_dict['NAME']})")
+        self.stdout.write(f"orders: {options['orders']} x {options['items']} items")
+        self.stdout.write(f"queries per order: {len(queries)}")
+        self.stdout.write(f"throughput: {options['orders'] / elapsed:.1f} orders/s")
+        self.stdout.write(
+            f"latency ms: p50={quantiles[49] * 1000:.2f} p95={quantiles[94] * 1000:.2f} p99={quantiles[98] * 1000:.2f}"
+        )
@@ -0,0 +1,90 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from FoodApp.models import Order, Restaurant, User
+from FoodApp.renderers import MessagePackRenderer, ORJSONRenderer, msgpack, orjson
+from FoodApp.serializers.order_serializers import OrderSerializer
+from FoodApp.serializers.restaurant_serializers import RestaurantSerializer
+from FoodApp.serializers.row_serializers import order_rows, restaurant_rows, user_rows
+from FoodApp.serializers.user_serializers import UserSerializer
+
+MODELS = {
+    "users": (User, UserSerializer, user_rows),
+    "restaurants": (Restaurant, RestaurantSerializer, restaurant_rows),
+    "orders": (Order, OrderSerializer, order_rows),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time one list response (fetch, serialize, render) with the stock stack (model instances, "
+        "ModelSerializer, DRF JSONRenderer) against the fast path (.values() rows, RowSerializer, "
+        "orjson / MessagePack renderers). Reports the median of --repeat runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=list(MODELS), default="users")
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        model, serializer_class, rows = MODELS[options["model"]]
+        queryset = model.objects.order_by("-id")[: options["rows"]]
+        count = queryset.count()
+        if not count:
+            raise CommandError(f"Nenhum registro em {model.__name__}; rode seed_data antes.")
+
+        stacks = {
+            "ModelSerializer + json": (
+                lambda: list(queryset.all()),
+                lambda objects: serializer_class(objects, many=True).data,
+                JSONRenderer(),
+            ),
+            "RowSerializer + json": (
+                lambda: list(rows.values(queryset)),
+                rows.many,
+                JSONRenderer(),
+            ),
+        }
+        if orjson is not None:
+            stacks["RowSerializer + orjson"] = (
+                lambda: list(rows.values(queryset)), rows.many, ORJSONRenderer()
+            )
+        if msgpack is not None:
+            stacks["RowSerializer + msgpack"] = (
+                lambda: list(rows.values(queryset)), rows.many, MessagePackRenderer()
+            )
+
+        self.stdout.write(
+            f"{count} {options['model']} per response, median of {options['repeat']} runs "
+            f"(orjson: {'yes' if orjson else 'no'}, msgpack: {'yes' if msgpack else 'no'})"
+        )
+        self.stdout.write(
+            f"{'stack':28} {'fetch ms':>9} {'serialize':>10} {'render':>8} {'total':>8} "
+            f"{'rows/s':>9} {'bytes':>9} {'speedup':>8}"
+        )
+        baseline = None
+        for label, (fetch, serialize, renderer) in stacks.items():
+            timings = {"fetch": [], "serialize": [], "render": []}
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                objects = fetch()
+                fetched = time.perf_counter()
+                data = serialize(objects)
+                serialized = time.perf_counter()
+                body = renderer.render(data)
+                rendered = time.perf_counter()
+                timings["fetch"].append(fetched - started)
+                timings["serialize"].append(serialized - fetched)
+                timings["render"].append(rendered - serialized)
+            medians = {stage: statistics.median(values) for stage, values in timings.items()}
+            total = sum(medians.values())
+            baseline = baseline or total
+            self.stdout.write(
+                f"{label:28} {medians['fetch'] * 1000:9.2f} {medians['serialize'] * 1000:10.2f} "
+                f"{medians['render'] * 1000:8.2f} {total * 1000:8.2f} {count / total:9.0f} "
+                f"{len(body):9} {baseline / total:7.1f}x"
+            )
@@ -0,0 +1,173 @@
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections
+
+from config.database import SQLITE_TUNED_OPTIONS
+from FoodApp.models import Order, OrderStatus, Product, Restaurant, User
+from FoodApp.serializers.order_serializers import CreateOrderSerializer
+from FoodApp.services.reference_data import PENDING_STATUS, order_statuses
+
+PROFILES = {
+    "default": {"init_command": "PRAGMA journal_mode=DELETE"},
+    "tuned": SQLITE_TUNED_OPTIONS,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Place orders from many writer threads against copies of the configured SQLite database, "
+        "once per connection profile (Django defaults vs SQLITE_TUNING), while reader threads list "
+        "the restaurant's orders. Reports throughput, latency and 'database is locked' failures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--orders", type=int, default=50, help="Orders per thread.")
+        parser.add_argument("--items", type=int, default=3)
+        parser.add_argument("--readers", type=int, default=8, help="Threads reading while writers run.")
+        parser.add_argument("--profile", choices=[*PROFILES, "both"], default="both")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Este benchmark só se aplica a SQLite.")
+        profiles = list(PROFILES) if options["profile"] == "both" else [options["profile"]]
+        database = connections.settings[DEFAULT_DB_ALIAS]
+        original = database["NAME"], database["OPTIONS"]
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for profile in profiles:
+                    path = os.path.join(directory, f"{profile}.sqlite3")
+                    connection.ensure_connection()
+                    target = sqlite3.connect(path)
+                    connection.connection.backup(target)
+                    target.close()
+
+                    connections.close_all()
+                    database["NAME"], database["OPTIONS"] = path, dict(PROFILES[profile])
+                    self.report(profile, self.run(options))
+                    connections.close_all()
+        finally:
+            database["NAME"], database["OPTIONS"] = original
+            connections.close_all()
+
+    def prepare(self, items):
+        tag = uuid.uuid4().hex[:8]
+        if not OrderStatus.objects.filter(name=PENDING_STATUS).exists():
+            OrderStatus.objects.create(name=PENDING_STATUS)
+            order_statuses.refresh()
+        owner = User.objects.create(
+            username=f"bench_owner_{tag}", phone="11999999999",
+            email=f"owner-{tag}@bench.local", password_hash="!",
+        )
+        customer = User.objects.create(
+            username=f"bench_customer_{tag}", phone="11999999999",
+            email=f"customer-{tag}@bench.local", password_hash="!",
+        )
+        restaurant = Restaurant.objects.create(name=f"Bench {tag}", owner_id=owner, cnpj=f"bench-{tag}")
+        products = Product.objects.bulk_create(
+            [Product(restaurant_id=restaurant, name=f"Produto {index}", base_price="19.90") for index in range(items)]
+        )
+        return {
+            "user_id": customer.id,
+            "restaurant_id": restaurant.id,
+            "items": [{"product_id": product.id, "quantity": 1} for product in products],
+        }
+
+    def run(self, options):
+        payload = self.prepare(options["items"])
+        lock = threading.Lock()
+        done = threading.Event()
+        latencies, failures = [], []
+        reads = []
+
+        def writer():
+            try:
+                for _ in range(options["orders"]):
+                    begin = time.perf_counter()
+                    try:
+                        serializer = CreateOrderSerializer(data=payload)
+                        serializer.is_valid(raise_exception=True)
+                        serializer.save()
+                    except OperationalError as error:
+                        with lock:
+                            failures.append(str(error))
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - begin)
+            finally:
+                connections.close_all()
+
+        def reader():
+            count = 0
+            try:
+                while not done.is_set():
+                    try:
+                        list(
+                            Order.objects.filter(restaurant_id=payload["restaurant_id"])
+                            .order_by("-created_at")[:20]
+                        )
+                        count += 1
+                    except OperationalError as error:
+                        with lock:
+                            failures.append(f"read: {error}")
+            finally:
+                with lock:
+                    reads.append(count)
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"] + options["readers"]) as pool:
+            readers = [pool.submit(reader) for _ in range(options["readers"])]
+            for future in [pool.submit(writer) for _ in range(options["threads"])]:
+                future.result()
+            elapsed = time.perf_counter() - started
+            done.set()
+            for future in readers:
+                future.result()
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            journal_mode = cursor.fetchone()[0]
+        return {
+            "threads": options["threads"],
+            "readers": options["readers"],
+            "reads": sum(reads),
+            "journal_mode": journal_mode,
+            "transaction_mode": connection.transaction_mode or "DEFERRED",
+            "latencies": sorted(latencies),
+            "failures": failures,
+            "elapsed": elapsed,
+        }
+
+    def report(self, profile, result):
+        latencies = result["latencies"]
+        read_failures = [failure for failure in result["failures"] if failure.startswith("read: ")]
+        write_failures = [failure for failure in result["failures"] if not failure.startswith("read: ")]
+        locked = sum("locked" in failure for failure in write_failures)
+        self.stdout.write(
+            f"[{profile}] journal_mode={result['journal_mode']} transaction_mode={result['transaction_mode']} "
+            f"writers={result['threads']} readers={result['readers']}"
+        )
+        self.stdout.write(
+            f"  orders ok: {len(latencies)}, failed: {len(write_failures)} (database is locked: {locked}), "
+            f"failed reads: {len(read_failures)}"
+        )
+        self.stdout.write(
+            f"  throughput: {len(latencies) / result['elapsed']:.1f} orders/s, "
+            f"{result['reads'] / result['elapsed']:.1f} reads/s"
+        )
+        if len(latencies) > 1:
+            quantiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"  latency ms: p50={quantiles[49] * 1000:.1f} p95={quantiles[94] * 1000:.1f} "
+                f"p99={quantiles[98] * 1000:.1f}"
+            )
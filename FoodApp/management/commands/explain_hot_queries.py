@@ -0,0 +1,66 @@
+import re
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.functions import Lower
+
+from FoodApp.models import Address, Order, Product, Restaurant, RestaurantReview, User
+
+FULL_SCAN = {
+    "sqlite": re.compile(r"\bSCAN (?!.*\bUSING (COVERING )?INDEX\b)"),
+    "postgresql": re.compile(r"\bSeq Scan\b"),
+    "mysql": re.compile(r"\btype\W+ALL\b"),
+}
+
+
+def hot_queries():
+    return {
+        "orders by user": Order.objects.filter(user_id=1).order_by("-created_at")[:20],
+        "orders by restaurant": Order.objects.filter(restaurant_id=1).order_by("-created_at", "-id")[:20],
+        "orders by restaurant and status": Order.objects.filter(restaurant_id=1, status_id=1).order_by("-created_at")[:20],
+        "reviews by restaurant": RestaurantReview.objects.filter(restaurant_id=1).order_by("-created_at")[:20],
+        "menu products": Product.objects.filter(restaurant_id=1).order_by("name"),
+        "active users": User.objects.filter(is_active=True).order_by("-created_at")[:20],
+        "user by email": User.objects.annotate(email_lower=Lower("email")).filter(email_lower="user@example.com"),
+        "restaurants by rating": Restaurant.objects.order_by("-rating_avg")[:20],
+        "restaurants by creation": Restaurant.objects.order_by("-created_at", "-id")[:20],
+        "addresses by geohash cell": Address.objects.filter(geohash__gte="6gyf4", geohash__lt="6gyf4{"),
+    }
+
+
+@contextmanager
+def prefer_indexes():
+    if connection.vendor != "postgresql":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SET enable_seqscan = off")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("RESET enable_seqscan")
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the hot queries and fail if any of them falls back to a full table scan."
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Unsupported database vendor: {connection.vendor}")
+
+        failures = []
+        with prefer_indexes():
+            for name, queryset in hot_queries().items():
+                plan = queryset.explain()
+                if pattern.search(plan):
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}"))
+                    self.stdout.write(plan)
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"ok         {name}"))
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot query(ies) fall back to a full table scan.")
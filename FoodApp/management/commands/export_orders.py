@@ -0,0 +1,42 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from FoodApp.models import Restaurant
+from FoodApp.services.exports import CONTENT_TYPES, export_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a restaurant's orders (with items and options) or reviews as CSV or JSONL to a file "
+        "or stdout. Rows are read in chunks through a server-side cursor, so memory stays flat."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("restaurant_id", type=int)
+        parser.add_argument("--format", dest="file_format", choices=list(CONTENT_TYPES), default="csv")
+        parser.add_argument("--reviews", action="store_true", help="Export reviews instead of orders.")
+        parser.add_argument("--start", type=date.fromisoformat, help="First day (YYYY-MM-DD, UTC).")
+        parser.add_argument("--end", type=date.fromisoformat, help="Last day, inclusive.")
+        parser.add_argument("--output", help="File to write; defaults to stdout.")
+
+    def handle(self, *args, **options):
+        restaurant_id = options["restaurant_id"]
+        if not Restaurant.objects.filter(id=restaurant_id).exists():
+            raise CommandError(f"Restaurant not found: {restaurant_id}")
+        if options["start"] and options["end"] and options["start"] > options["end"]:
+            raise CommandError("--start deve ser anterior a --end.")
+
+        blocks = export_lines(
+            "reviews" if options["reviews"] else "orders",
+            options["file_format"],
+            restaurant_id,
+            options["start"],
+            options["end"],
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                output.writelines(blocks)
+        else:
+            for block in blocks:
+                self.stdout.write(block, ending="")
@@ -0,0 +1,42 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from FoodApp.services.user_import import DEFAULT_CHUNK_SIZE, import_users
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(handle)
+            return
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = "Import users from a .csv or .jsonl file in batched chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", type=Path)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["file"]
+        if path.suffix.lower() not in (".csv", ".jsonl"):
+            raise CommandError("O arquivo deve ser .csv ou .jsonl")
+        if not path.exists():
+            raise CommandError(f"Arquivo não encontrado: {path}")
+
+        summary = import_users(read_rows(path), chunk_size=options["chunk_size"])
+        for error in summary["errors"]:
+            self.stderr.write(f"linha {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        if summary["failed"] > len(summary["errors"]):
+            self.stderr.write(f"... e mais {summary['failed'] - len(summary['errors'])} linhas com erro.")
+        self.stdout.write(
+            self.style.SUCCESS(f"{summary['created']} usuários criados, {summary['failed']} com erro.")
+        )
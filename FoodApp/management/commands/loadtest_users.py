@@ -0,0 +1,74 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def fetch(host, port, path, hold):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n".encode())
+        if hold:
+            await writer.drain()
+            await asyncio.sleep(hold)
+        started = time.perf_counter()
+        writer.write(b"Connection: close\r\n\r\n")
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1]), time.perf_counter() - started
+    finally:
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test GET /user/<id> with many concurrent, optionally slow, clients. "
+        "Run it once against a WSGI server (/user/<id>) and once against uvicorn (/async/user/<id>)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="e.g. http://127.0.0.1:8000/async/user/1")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument(
+            "--hold", type=float, default=0.0,
+            help="Seconds each client keeps its connection open before finishing the request.",
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("Use uma URL http://host:porta/caminho")
+        path = url.path + (f"?{url.query}" if url.query else "")
+        results, elapsed = asyncio.run(self.run(url.hostname, url.port or 80, path, options))
+
+        latencies = sorted(latency for status, latency in results if status == 200)
+        failures = len(results) - len(latencies)
+        self.stdout.write(f"target: {options['url']}")
+        self.stdout.write(
+            f"requests: {len(results)}, concurrency: {options['concurrency']}, hold: {options['hold']}s"
+        )
+        self.stdout.write(f"throughput: {len(results) / elapsed:.1f} req/s, failures: {failures}")
+        if len(latencies) > 1:
+            quantiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"latency ms: p50={quantiles[49] * 1000:.1f} p95={quantiles[94] * 1000:.1f} "
+                f"p99={quantiles[98] * 1000:.1f}"
+            )
+
+    async def run(self, host, port, path, options):
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def one():
+            async with semaphore:
+                try:
+                    return await fetch(host, port, path, options["hold"])
+                except (OSError, ValueError, IndexError):
+                    return 0, 0.0
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(options["requests"])))
+        return results, time.perf_counter() - started
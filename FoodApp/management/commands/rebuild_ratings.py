@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from FoodApp.services.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized restaurant rating aggregates from RestaurantReview."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        updated, cleared = rebuild_ratings(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{updated} restaurants updated, {cleared} reset to zero.")
+        )
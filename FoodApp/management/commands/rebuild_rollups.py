@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from FoodApp.services.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the restaurant analytics rollups from Order and OrderItems."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--restaurant", type=int, help="Only rebuild this restaurant.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        hours, days = rebuild_rollups(
+            restaurant_id=options["restaurant"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"{hours} hourly rows and {days} product-day rows rebuilt.")
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from FoodApp.services.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index for restaurants, products and food categories."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} entradas indexadas."))
@@ -0,0 +1,267 @@
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from FoodApp.models import (
+    Address,
+    FoodCategory,
+    Options,
+    OptionGroups,
+    Order,
+    OrderItemOptions,
+    OrderItems,
+    Product,
+    Restaurant,
+    RestaurantCategory,
+    RestaurantReview,
+    User,
+)
+from FoodApp.services import geohash
+from FoodApp.services.analytics import rebuild_rollups
+from FoodApp.services.category_index import category_index
+from FoodApp.services.geo_index import geo_index
+from FoodApp.services.ratings import rebuild_ratings
+from FoodApp.services.reference_data import DEFAULT_ROLE, order_statuses, roles
+from FoodApp.services.search import rebuild_index
+
+FIRST_NAMES = ["ana", "bruno", "carla", "diego", "elisa", "felipe", "gabi", "heitor", "iara", "joao"]
+RESTAURANT_KINDS = ["Pizzaria", "Cantina", "Hamburgueria", "Sushi", "Padaria", "Churrascaria", "Açaí", "Pastelaria"]
+RESTAURANT_NAMES = ["do Zé", "Bella", "São Jorge", "Central", "da Vila", "Sabor", "Paulista", "Estrela"]
+DISHES = [
+    "Pizza Margherita", "X-Burger", "Temaki de Salmão", "Pão de Queijo", "Picanha", "Açaí na Tigela",
+    "Pastel de Carne", "Feijoada", "Coxinha", "Lasanha", "Moqueca", "Strogonoff", "Yakisoba", "Brigadeiro",
+]
+CATEGORIES = [
+    "Pizza", "Lanches", "Japonesa", "Brasileira", "Italiana", "Doces", "Padaria", "Saudável",
+    "Carnes", "Árabe", "Chinesa", "Mexicana", "Vegana", "Bebidas", "Sorvetes", "Frutos do Mar",
+]
+CENTER = (-23.5505, -46.6333)
+
+
+@contextmanager
+def backdated(model):
+    # The flag lives on the shared Field, so put back whatever it was before.
+    field = model._meta.get_field("created_at")
+    previous = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = previous
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed the configured database with synthetic users, restaurants, menus, reviews and orders "
+        "using bulk_create. Orders are generated in batches, so millions of rows use constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--restaurants", type=int, default=500)
+        parser.add_argument("--products", type=int, default=15, help="Products per restaurant.")
+        parser.add_argument("--reviews", type=int, default=20000)
+        parser.add_argument("--orders", type=int, default=100000)
+        parser.add_argument("--days", type=int, default=90, help="Spread orders over this many days.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.tag = uuid.uuid4().hex[:8]
+
+        call_command("loaddata", "roles.json", "orderStatus.json", verbosity=0)
+        roles.refresh()
+        order_statuses.refresh()
+
+        users = self.phase("users", self.seed_users, options["users"])
+        restaurants = self.phase("restaurants", self.seed_restaurants, options["restaurants"], users)
+        self.phase("categories", self.seed_categories, restaurants)
+        menus = self.phase("menus", self.seed_menus, restaurants, options["products"])
+        self.phase("reviews", self.seed_reviews, options["reviews"], users, restaurants)
+        self.phase("orders", self.seed_orders, options["orders"], options["days"], users, menus)
+
+        self.phase("ratings", lambda: rebuild_ratings()[0])
+        self.phase("search index", rebuild_index)
+        self.phase("rollups", lambda: sum(rebuild_rollups()))
+        geo_index.changed()
+        category_index.changed()
+        self.stdout.write(self.style.SUCCESS(f"Seed '{self.tag}' concluído."))
+
+    def phase(self, name, function, *args):
+        started = time.perf_counter()
+        result = function(*args)
+        count = result if isinstance(result, int) else len(result)
+        self.stdout.write(f"{name}: {count} rows in {time.perf_counter() - started:.1f}s")
+        return result
+
+    def bulk(self, model, objects):
+        created = []
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                created.extend(model.objects.bulk_create(batch))
+        return created
+
+    def seed_users(self, count):
+        role_id = roles.get(name=DEFAULT_ROLE).id
+        users = self.bulk(User, (
+            User(
+                username=f"{self.rng.choice(FIRST_NAMES)}_{self.tag}_{index}",
+                role_id=role_id,
+                phone=f"119{self.rng.randrange(10**7, 10**8)}",
+                email=f"seed-{self.tag}-{index}@seed.local",
+                password_hash="!",
+            )
+            for index in range(count)
+        ))
+        return [user.id for user in users]
+
+    def seed_restaurants(self, count, users):
+        owner_role = roles.get(name="restaurant_owner").id
+        owners = self.rng.sample(users, min(count, len(users)))
+        User.objects.filter(id__in=owners).update(role_id=owner_role)
+        restaurants = self.bulk(Restaurant, (
+            Restaurant(
+                name=f"{self.rng.choice(RESTAURANT_KINDS)} {self.rng.choice(RESTAURANT_NAMES)} {index}",
+                owner_id_id=owners[index % len(owners)],
+                cnpj=f"seed-{self.tag}-{index}",
+            )
+            for index in range(count)
+        ))
+        addresses = []
+        for restaurant in restaurants:
+            latitude = Decimal(f"{CENTER[0] + self.rng.uniform(-0.2, 0.2):.6f}")
+            longitude = Decimal(f"{CENTER[1] + self.rng.uniform(-0.2, 0.2):.6f}")
+            addresses.append(Address(
+                street="Rua Seed", number=str(self.rng.randrange(1, 3000)), complement="",
+                neighborhood="Centro", city="São Paulo", state="SP", zip_code="01000-000",
+                latitude=latitude, longitude=longitude,
+                geohash=geohash.encode(latitude, longitude),
+                restaurant_id=restaurant,
+            ))
+        self.bulk(Address, addresses)
+        return [restaurant.id for restaurant in restaurants]
+
+    def seed_categories(self, restaurants):
+        categories = self.bulk(FoodCategory, (FoodCategory(name=name) for name in CATEGORIES))
+        links = self.bulk(RestaurantCategory, (
+            RestaurantCategory(restaurant_id_id=restaurant_id, food_category_id=category)
+            for restaurant_id in restaurants
+            for category in self.rng.sample(categories, self.rng.randint(1, 3))
+        ))
+        return len(categories) + len(links)
+
+    def seed_menus(self, restaurants, per_restaurant):
+        products = self.bulk(Product, (
+            Product(
+                restaurant_id_id=restaurant_id,
+                name=f"{self.rng.choice(DISHES)} {index}",
+                description="Gerado pelo seed_data",
+                base_price=Decimal(self.rng.randrange(990, 8990)) / 100,
+            )
+            for restaurant_id in restaurants
+            for index in range(per_restaurant)
+        ))
+        groups = self.bulk(OptionGroups, (
+            group
+            for product in products
+            for group in (
+                OptionGroups(product_id=product, name="Tamanho", is_required=True,
+                             min_selection=1, max_selection=1),
+                OptionGroups(product_id=product, name="Adicionais", min_selection=0, max_selection=2),
+            )
+        ))
+        options = self.bulk(Options, (
+            Options(option_group_id=group, name=name, extra_price=Decimal(price))
+            for group in groups
+            for name, price in (
+                (("P", "0.00"), ("M", "4.00"), ("G", "8.00")) if group.is_required
+                else (("Queijo", "2.50"), ("Bacon", "3.50"), ("Ovo", "1.50"))
+            )
+        ))
+
+        choices = {group.id: [] for group in groups}
+        for option in options:
+            choices[option.option_group_id_id].append((option.id, option.extra_price))
+        menus = {restaurant_id: [] for restaurant_id in restaurants}
+        for product, size, extras in zip(products, groups[0::2], groups[1::2]):
+            menus[product.restaurant_id_id].append(
+                (product.id, product.base_price, choices[size.id], choices[extras.id])
+            )
+        return menus
+
+    def seed_reviews(self, count, users, restaurants):
+        return self.bulk(RestaurantReview, (
+            RestaurantReview(
+                restaurant_id_id=self.rng.choice(restaurants),
+                user_id_id=self.rng.choice(users),
+                rating=self.rng.choices(range(1, 6), weights=(1, 1, 3, 6, 8))[0],
+            )
+            for _ in range(count)
+        ))
+
+    def seed_orders(self, count, days, users, menus):
+        statuses = [status.id for status in order_statuses.all()]
+        restaurants = [restaurant_id for restaurant_id, menu in menus.items() if menu]
+        now = timezone.now()
+        span = days * 24 * 3600
+        created = 0
+        with backdated(Order):
+            for batch in batched(range(count), self.batch_size):
+                orders, lines = [], []
+                for _ in batch:
+                    restaurant_id = self.rng.choice(restaurants)
+                    menu = menus[restaurant_id]
+                    items = []
+                    total = Decimal("0")
+                    picks = self.rng.sample(menu, min(len(menu), self.rng.randint(1, 4)))
+                    for product_id, base_price, sizes, extras in picks:
+                        picked = [self.rng.choice(sizes), *self.rng.sample(extras, self.rng.randint(0, 2))]
+                        quantity = self.rng.randint(1, 3)
+                        total += (base_price + sum(price for _, price in picked)) * quantity
+                        items.append((product_id, base_price, quantity, [option_id for option_id, _ in picked]))
+                    orders.append(Order(
+                        user_id_id=self.rng.choice(users),
+                        restaurant_id_id=restaurant_id,
+                        status_id=self.rng.choice(statuses),
+                        total_price=total,
+                        created_at=now - timedelta(seconds=self.rng.randrange(span)),
+                    ))
+                    lines.append(items)
+                with transaction.atomic():
+                    Order.objects.bulk_create(orders)
+                    order_items = OrderItems.objects.bulk_create([
+                        OrderItems(
+                            order_id=order, product_id_id=product_id, quantity=quantity, base_price=base_price
+                        )
+                        for order, items in zip(orders, lines)
+                        for product_id, base_price, quantity, _ in items
+                    ])
+                    selected = (option_ids for items in lines for *_, option_ids in items)
+                    OrderItemOptions.objects.bulk_create([
+                        OrderItemOptions(order_item_id=item, option_id_id=option_id)
+                        for item, option_ids in zip(order_items, selected)
+                        for option_id in option_ids
+                    ])
+                created += len(orders)
+        return created
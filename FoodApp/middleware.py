@@ -0,0 +1,189 @@
+import logging
+import re
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional: responses are gzipped only
+    brotli = None
+
+from .routers import pinned_to_primary, replica_aliases, routing_scope
+from .services.metrics import QueryRecorder, request_metrics
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "db_primary"
+ACCEPTS_BROTLI = re.compile(r"\bbr\b")
+# Quality 5 is close to gzip's speed and still noticeably smaller for JSON.
+BROTLI_QUALITY = 5
+
+
+class RequestMetricsMiddleware:
+    """Count and time SQL per request, emit ``Server-Timing`` and feed ``/metrics``.
+
+    ``view`` runs from URL resolution until the view returns; ``serialize`` is
+    the DRF renderer turning the response data into bytes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, "REQUEST_METRICS_N_PLUS_ONE_THRESHOLD", 10)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = self.start(request)
+        with self.capture(recorder):
+            response = self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    async def __acall__(self, request):
+        # Connections are per thread: async views query through sync_to_async, so the
+        # wrappers go on the thread-sensitive executor's connections.
+        recorder = self.start(request)
+        stack = await sync_to_async(self.capture)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder)
+
+    def start(self, request):
+        request._metrics = {"started": perf_counter()}
+        return QueryRecorder()
+
+    def capture(self, recorder):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics["view_started"] = perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request._metrics
+        timings["view_ended"] = perf_counter()
+        response.add_post_render_callback(
+            lambda rendered: timings.__setitem__("rendered", perf_counter())
+        )
+        return response
+
+    def finish(self, request, response, recorder):
+        timings = request._metrics
+        ended = perf_counter()
+        total = ended - timings["started"]
+        view_started = timings.get("view_started", ended)
+        view_ended = timings.get("view_ended", ended)
+        serialize = timings.get("rendered", view_ended) - view_ended
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries"',
+            f"view;dur={(view_ended - view_started) * 1000:.2f}",
+            f"serialize;dur={serialize * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ])
+
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+        repeated = recorder.repeated(self.threshold)
+        for shape, count in repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: %d executions of %s", request.method, route, count, shape[:300]
+            )
+        request_metrics.record(route, request.method, response.status_code, total, recorder, bool(repeated))
+        return response
+
+
+class PrimaryStickinessMiddleware:
+    """Scope replica routing to the request: writes (and reads after them) use the primary.
+
+    Unsafe requests also leave a short-lived cookie so the client's next reads skip
+    the replicas until they have had time to catch up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        pinned = self.starts_pinned(request)
+        with routing_scope(pinned):
+            response = self.get_response(request)
+            wrote = pinned_to_primary() and not pinned
+        return self.remember(request, response, wrote)
+
+    async def __acall__(self, request):
+        pinned = self.starts_pinned(request)
+        with routing_scope(pinned):
+            response = await self.get_response(request)
+            wrote = pinned_to_primary() and not pinned
+        return self.remember(request, response, wrote)
+
+    def starts_pinned(self, request):
+        return request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES
+
+    def remember(self, request, response, wrote):
+        if replica_aliases() and (wrote or request.method not in SAFE_METHODS):
+            response.set_cookie(
+                STICKY_COOKIE, "1",
+                max_age=getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5),
+                httponly=True, samesite="Lax",
+            )
+        return response
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compress responses of at least RESPONSE_COMPRESSION_MIN_LENGTH bytes.
+
+    Uses brotli when it is installed and the client accepts ``br``, otherwise
+    Django's gzip. Event streams are left alone: a compressor buffers its input,
+    which would hold back SSE events.
+    """
+
+    def process_response(self, request, response):
+        if response.get("Content-Type", "").startswith("text/event-stream"):
+            return response
+        min_length = getattr(settings, "RESPONSE_COMPRESSION_MIN_LENGTH", 1024)
+        if not response.streaming and len(response.content) < min_length:
+            return response
+        if (
+            brotli is None
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or not ACCEPTS_BROTLI.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
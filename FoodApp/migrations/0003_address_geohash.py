@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+from FoodApp.services import geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    Address = apps.get_model('FoodApp', 'Address')
+    pending = Address.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    batch = []
+    for address in pending.only('id', 'latitude', 'longitude').iterator(chunk_size=2000):
+        address.geohash = geohash.encode(address.latitude, address.longitude)
+        batch.append(address)
+        if len(batch) >= 2000:
+            Address.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    if batch:
+        Address.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FoodApp', '0002_user_cpf_alter_address_id_alter_foodcategory_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
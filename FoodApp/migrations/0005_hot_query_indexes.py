@@ -0,0 +1,89 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:11
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def dedupe_emails(apps, schema_editor):
+    """Make emails unique ignoring case before user_email_ci_unique is added.
+
+    For each case-insensitive duplicate the active, oldest account keeps its email;
+    the others get ``local+duplicate-<id>@domain`` so no row is lost and the
+    accounts can still be told apart and fixed by hand.
+    """
+    User = apps.get_model('FoodApp', 'User')
+    duplicated = (
+        User.objects.annotate(email_lower=Lower('email'))
+        .values('email_lower')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_lower', flat=True)
+    )
+    for email in list(duplicated):
+        accounts = (
+            User.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower=email)
+            .order_by('-is_active', 'id')
+        )
+        for user in list(accounts)[1:]:
+            local, _, domain = user.email.rpartition('@')
+            user.email = f'{local}+duplicate-{user.id}@{domain}'
+            user.save(update_fields=['email'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FoodApp', '0004_restaurant_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user_id', '-created_at'], name='order_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['restaurant_id', 'status', '-created_at'], name='order_rest_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['restaurant_id', 'name'], name='product_restaurant_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurantreview',
+            index=models.Index(fields=['restaurant_id', '-created_at'], name='review_restaurant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='user_active_created_idx'),
+        ),
+        migrations.RunPython(dedupe_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='user_email_ci_unique'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='restaurant_id',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.restaurant'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='user_id',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.user'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='restaurant_id',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.restaurant'),
+        ),
+        migrations.AlterField(
+            model_name='restaurantreview',
+            name='restaurant_id',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.restaurant'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FoodApp', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['restaurant_id', '-created_at'], name='order_rest_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['-created_at'], name='restaurant_created_idx'),
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:29
+
+from django.db import migrations, models
+
+from FoodApp.services.text import normalize
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE "FoodApp_searchentry_fts" USING fts5(
+        title, body,
+        content='FoodApp_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER "FoodApp_searchentry_ai" AFTER INSERT ON "FoodApp_searchentry" BEGIN
+        INSERT INTO "FoodApp_searchentry_fts"(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER "FoodApp_searchentry_ad" AFTER DELETE ON "FoodApp_searchentry" BEGIN
+        INSERT INTO "FoodApp_searchentry_fts"("FoodApp_searchentry_fts", rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER "FoodApp_searchentry_au" AFTER UPDATE ON "FoodApp_searchentry" BEGIN
+        INSERT INTO "FoodApp_searchentry_fts"("FoodApp_searchentry_fts", rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO "FoodApp_searchentry_fts"(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS "FoodApp_searchentry_au"',
+    'DROP TRIGGER IF EXISTS "FoodApp_searchentry_ad"',
+    'DROP TRIGGER IF EXISTS "FoodApp_searchentry_ai"',
+    'DROP TABLE IF EXISTS "FoodApp_searchentry_fts"',
+]
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX "FoodApp_searchentry_tsv" ON "FoodApp_searchentry"
+    USING GIN (to_tsvector('simple', search_text))
+    """,
+]
+POSTGRES_BACKWARD = ['DROP INDEX IF EXISTS "FoodApp_searchentry_tsv"']
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+def backfill_entries(apps, schema_editor):
+    SearchEntry = apps.get_model('FoodApp', 'SearchEntry')
+    sources = [
+        ('restaurant', apps.get_model('FoodApp', 'Restaurant'), None),
+        ('product', apps.get_model('FoodApp', 'Product'), 'description'),
+        ('category', apps.get_model('FoodApp', 'FoodCategory'), None),
+    ]
+    for kind, model, body_field in sources:
+        fields = ['id', 'name'] + ([body_field] if body_field else [])
+        batch = []
+        for row in model.objects.values(*fields).iterator(chunk_size=2000):
+            body = (row.get(body_field) if body_field else '') or ''
+            batch.append(SearchEntry(
+                kind=kind, object_id=row['id'], title=row['name'], body=body,
+                search_text=normalize(f"{row['name']} {body}"),
+            ))
+            if len(batch) >= 2000:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FoodApp', '0006_keyset_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('body', models.TextField(blank=True, default='')),
+                ('search_text', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry')],
+            },
+        ),
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            run_for_vendor({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+        migrations.RunPython(backfill_entries, migrations.RunPython.noop),
+    ]
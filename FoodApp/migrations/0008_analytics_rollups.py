@@ -0,0 +1,99 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:33
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncHour
+
+
+def backfill_rollups(apps, schema_editor):
+    """Count every order except cancelled ones, as the live path and rebuild_rollups do."""
+    Order = apps.get_model('FoodApp', 'Order')
+    OrderItems = apps.get_model('FoodApp', 'OrderItems')
+    OrderStatus = apps.get_model('FoodApp', 'OrderStatus')
+    RestaurantHourlyRollup = apps.get_model('FoodApp', 'RestaurantHourlyRollup')
+    ProductDailyRollup = apps.get_model('FoodApp', 'ProductDailyRollup')
+    utc = datetime.timezone.utc
+    orders = Order.objects.all()
+    items = OrderItems.objects.all()
+    cancelled = OrderStatus.objects.filter(name='Cancelled').values_list('id', flat=True).first()
+    if cancelled is not None:
+        orders = orders.exclude(status_id=cancelled)
+        items = items.exclude(order_id__status_id=cancelled)
+    hours = (
+        orders.annotate(hour=TruncHour('created_at', tzinfo=utc))
+        .values('restaurant_id', 'hour')
+        .annotate(order_count=Count('id'), revenue=Sum('total_price'))
+        .order_by()
+    )
+    RestaurantHourlyRollup.objects.bulk_create(
+        [
+            RestaurantHourlyRollup(
+                restaurant_id_id=row['restaurant_id'], hour=row['hour'],
+                order_count=row['order_count'], revenue=row['revenue'] or 0,
+            )
+            for row in hours
+        ],
+        batch_size=2000,
+    )
+    days = (
+        items.annotate(day=TruncDate('order_id__created_at', tzinfo=utc))
+        .values('order_id__restaurant_id', 'day', 'product_id')
+        .annotate(units=Sum('quantity'), sales=Sum(F('base_price') * F('quantity')))
+        .order_by()
+    )
+    ProductDailyRollup.objects.bulk_create(
+        [
+            ProductDailyRollup(
+                restaurant_id_id=row['order_id__restaurant_id'], day=row['day'],
+                product_id_id=row['product_id'], quantity=row['units'],
+                revenue=row['sales'] or 0,
+            )
+            for row in days
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FoodApp', '0007_search_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('product_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='FoodApp.product')),
+                ('restaurant_id', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.restaurant')),
+            ],
+            options={
+                'verbose_name': 'Product Daily Rollup',
+                'verbose_name_plural': 'Product Daily Rollups',
+                'constraints': [models.UniqueConstraint(fields=('restaurant_id', 'day', 'product_id'), name='unique_product_day_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RestaurantHourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('restaurant_id', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.restaurant')),
+            ],
+            options={
+                'verbose_name': 'Restaurant Hourly Rollup',
+                'verbose_name_plural': 'Restaurant Hourly Rollups',
+                'constraints': [models.UniqueConstraint(fields=('restaurant_id', 'hour'), name='unique_restaurant_hour_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
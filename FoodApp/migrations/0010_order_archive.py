@@ -0,0 +1,76 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FoodApp', '0009_order_claims'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('claimed_by', models.CharField(blank=True, max_length=64, null=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('month', models.DateField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('restaurant_id', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.restaurant')),
+                ('status', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='FoodApp.orderstatus')),
+                ('user_id', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='FoodApp.user')),
+            ],
+            options={
+                'verbose_name': 'Archived Order',
+                'verbose_name_plural': 'Archived Orders',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderItem',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('quantity', models.IntegerField()),
+                ('base_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('month', models.DateField(db_index=True)),
+                ('order_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='FoodApp.archivedorder')),
+                ('product_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='FoodApp.product')),
+            ],
+            options={
+                'verbose_name': 'Archived Order Item',
+                'verbose_name_plural': 'Archived Order Items',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderItemOption',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('month', models.DateField(db_index=True)),
+                ('option_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='FoodApp.options')),
+                ('order_item_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='FoodApp.archivedorderitem')),
+            ],
+            options={
+                'verbose_name': 'Archived Order Item Option',
+                'verbose_name_plural': 'Archived Order Item Options',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['user_id', '-created_at'], name='arch_order_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['restaurant_id', '-created_at'], name='arch_order_rest_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['month'], name='arch_order_month_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-18 21:11
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Greatest, Least
+
+
+def clamp_ratings(apps, schema_editor):
+    """Bring out-of-range ratings into 1-5 and recount the restaurants they belong to."""
+    Restaurant = apps.get_model('FoodApp', 'Restaurant')
+    RestaurantReview = apps.get_model('FoodApp', 'RestaurantReview')
+    out_of_range = RestaurantReview.objects.exclude(rating__gte=1, rating__lte=5)
+    restaurant_ids = set(out_of_range.values_list('restaurant_id', flat=True))
+    if not restaurant_ids:
+        return
+    out_of_range.update(rating=Least(Greatest('rating', 1), 5))
+    stars = range(1, 6)
+    stats = (
+        RestaurantReview.objects.filter(restaurant_id__in=restaurant_ids)
+        .order_by()
+        .values('restaurant_id')
+        .annotate(
+            count=Count('id'),
+            total=Sum('rating'),
+            **{f'stars_{star}': Count('id', filter=Q(rating=star)) for star in stars},
+        )
+    )
+    for row in stats:
+        Restaurant.objects.filter(id=row['restaurant_id']).update(
+            rating_count=row['count'],
+            rating_sum=row['total'],
+            rating_avg=row['total'] / row['count'],
+            **{f'rating_{star}_count': row[f'stars_{star}'] for star in stars},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FoodApp', '0010_order_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='restaurantreview',
+            name='rating',
+            field=models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+        migrations.RunPython(clamp_ratings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='restaurantreview',
+            constraint=models.CheckConstraint(condition=models.Q(('rating__gte', 1), ('rating__lte', 5)), name='review_rating_1_to_5'),
+        ),
+    ]
@@ -1,5 +1,9 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .services import geohash
 
 class User(models.Model):
     username = models.CharField(max_length=100)
@@ -11,7 +15,19 @@ class User(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     cpf = models.CharField(max_length=14, unique=True, blank=True, null=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-created_at'],
+                condition=Q(is_active=True),
+                name='user_active_created_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(Lower('email'), name='user_email_ci_unique'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -22,10 +38,44 @@ class Restaurant(models.Model):
     cnpj = models.CharField(max_length=20, unique=True)
     profile_picture = models.URLField(blank=True, null=True)
     profile_banner = models.URLField(blank=True, null=True)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_avg = models.FloatField(default=0, db_index=True)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='restaurant_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
+
+    # Kept current with F() updates by services.ratings. A full save() of an instance
+    # loaded earlier (the admin form, a serializer update) would write stale copies
+    # back, so updates without update_fields leave them out.
+    RATING_FIELDS = (
+        "rating_count", "rating_sum", "rating_avg",
+        "rating_1_count", "rating_2_count", "rating_3_count", "rating_4_count", "rating_5_count",
+    )
+
+    def save(self, *args, **kwargs):
+        if kwargs.get("update_fields") is None and not self._state.adding and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating_histogram(self):
+        return {star: getattr(self, f"rating_{star}_count") for star in range(1, 6)}
     
 
 class Roles(models.Model):
@@ -47,6 +97,7 @@ class Address(models.Model):
     zip_code = models.CharField(max_length=20)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True, editable=False)
 
     user_id = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, limit_choices_to={'is_staff': False})
     restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE, blank=True, null=True, limit_choices_to={'is_staff': False})
@@ -69,27 +120,60 @@ class Address(models.Model):
     def __str__(self):
         return f"{self.street}, {self.number} - {self.city}/{self.state}"
 
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geohash.encode(self.latitude, self.longitude)
+        else:
+            self.geohash = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
 class RestaurantReview(models.Model):
-    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE)
+    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE, db_index=False)
     user_id = models.ForeignKey(User, on_delete=models.CASCADE)
-    rating = models.IntegerField()
+    rating = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     comment = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['restaurant_id', '-created_at'], name='review_restaurant_created_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(rating__gte=1, rating__lte=5),
+                name='review_rating_1_to_5',
+            ),
+        ]
+
     def __str__(self):
         return f"Review by {self.user_id.username} for {self.restaurant_id.name}"
     
     
 
 class Order(models.Model):
-    user_id = models.ForeignKey(User, on_delete=models.CASCADE)
-    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE)
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE, db_index=False)
     status = models.ForeignKey('OrderStatus', on_delete=models.SET_NULL, null=True)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    claimed_by = models.CharField(max_length=64, blank=True, null=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_id', '-created_at'], name='order_user_created_idx'),
+            models.Index(fields=['restaurant_id', '-created_at'], name='order_rest_created_idx'),
+            models.Index(
+                fields=['restaurant_id', 'status', '-created_at'],
+                name='order_rest_status_created_idx',
+            ),
+        ]
+
 class OrderStatus(models.Model):
     name = models.CharField(max_length=50, unique=True)
 
@@ -101,7 +185,7 @@ class OrderStatus(models.Model):
         return self.name
     
 class Product(models.Model):
-    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE)
+    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     photo = models.URLField(blank=True, null=True)
@@ -112,6 +196,9 @@ class Product(models.Model):
     class Meta:
         verbose_name = "Product"
         verbose_name_plural = "Products"
+        indexes = [
+            models.Index(fields=['restaurant_id', 'name'], name='product_restaurant_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.restaurant_id.name}"
@@ -159,7 +246,7 @@ class OrderItems(models.Model):
         verbose_name = "Order Items"
         verbose_name_plural = "Order Items"
     def __str__(self):
-        return f"{self.quantity}x {self.product_id.name} for Order #{self.order_id.id}"
+        return f"{self.quantity}x {self.product_id.name} for Order #{self.order_id_id}"
     
 class OrderItemOptions(models.Model):
     order_item_id = models.ForeignKey(OrderItems, on_delete=models.CASCADE)
@@ -200,4 +287,112 @@ class RestaurantCategory(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.restaurant_id.name} - {self.category_id.name}"
\ No newline at end of file
+        return f"{self.restaurant_id.name} - {self.food_category_id.name}"
+
+
+class SearchEntry(models.Model):
+    KIND_RESTAURANT = "restaurant"
+    KIND_PRODUCT = "product"
+    KIND_CATEGORY = "category"
+
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True, default="")
+    search_text = models.TextField(blank=True, default="")
+
+    class Meta:
+        verbose_name = "Search Entry"
+        verbose_name_plural = "Search Entries"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry')
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+
+class RestaurantHourlyRollup(models.Model):
+    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE, db_index=False)
+    hour = models.DateTimeField()
+    order_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Restaurant Hourly Rollup"
+        verbose_name_plural = "Restaurant Hourly Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=['restaurant_id', 'hour'], name='unique_restaurant_hour_rollup')
+        ]
+
+
+class ProductDailyRollup(models.Model):
+    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE, db_index=False)
+    product_id = models.ForeignKey(Product, on_delete=models.CASCADE)
+    day = models.DateField()
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Product Daily Rollup"
+        verbose_name_plural = "Product Daily Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['restaurant_id', 'day', 'product_id'], name='unique_product_day_rollup'
+            )
+        ]
+
+
+class ArchivedOrder(models.Model):
+    id = models.IntegerField(primary_key=True)
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    restaurant_id = models.ForeignKey(Restaurant, on_delete=models.CASCADE, db_index=False)
+    status = models.ForeignKey('OrderStatus', on_delete=models.SET_NULL, null=True, db_index=False)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    claimed_by = models.CharField(max_length=64, blank=True, null=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    month = models.DateField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Archived Order"
+        verbose_name_plural = "Archived Orders"
+        indexes = [
+            models.Index(fields=['user_id', '-created_at'], name='arch_order_user_created_idx'),
+            models.Index(fields=['restaurant_id', '-created_at'], name='arch_order_rest_created_idx'),
+            models.Index(fields=['month'], name='arch_order_month_idx'),
+        ]
+
+
+class ArchivedOrderItem(models.Model):
+    id = models.IntegerField(primary_key=True)
+    order_id = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE)
+    product_id = models.ForeignKey(Product, on_delete=models.CASCADE)
+    quantity = models.IntegerField()
+    base_price = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    month = models.DateField(db_index=True)
+
+    class Meta:
+        verbose_name = "Archived Order Item"
+        verbose_name_plural = "Archived Order Items"
+
+    def __str__(self):
+        return f"{self.quantity}x {self.product_id.name} for Order #{self.order_id_id}"
+
+
+class ArchivedOrderItemOption(models.Model):
+    id = models.IntegerField(primary_key=True)
+    order_item_id = models.ForeignKey(ArchivedOrderItem, on_delete=models.CASCADE)
+    option_id = models.ForeignKey(Options, on_delete=models.CASCADE)
+    month = models.DateField(db_index=True)
+
+    class Meta:
+        verbose_name = "Archived Order Item Option"
+        verbose_name_plural = "Archived Order Item Options"
+
+    def __str__(self):
+        return f"{self.option_id.name} for {self.order_item_id.product_id.name}"
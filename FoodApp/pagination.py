@@ -0,0 +1,87 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    ordering_field = "created_at"
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def __init__(self, ordering_field=None):
+        if ordering_field is not None:
+            self.ordering_field = ordering_field
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, obj):
+        if isinstance(obj, dict):  # a .values() row
+            value, pk = obj[self.ordering_field], obj["id"]
+        else:
+            value, pk = getattr(obj, self.ordering_field), obj.pk
+        payload = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value, pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, queryset, encoded):
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            field = queryset.model._meta.get_field(self.ordering_field)
+            return field.to_python(value), int(pk)
+        except (ValueError, TypeError, ValidationError):
+            raise ParseError("Cursor inválido.")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """Page through ``querysets`` as if they were one, in the given order.
+
+        Every row of a queryset must sort after (be older than) every row of the
+        ones before it, e.g. live orders followed by archived ones; the cursor is
+        then valid for all of them and later querysets are only read once the
+        earlier ones run out.
+        """
+        self.request = request
+        size = self.get_page_size(request)
+        field = self.ordering_field
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        rows = []
+        for queryset in querysets:
+            queryset = queryset.order_by(f"-{field}", "-pk")
+            if encoded:
+                value, pk = self.decode_cursor(queryset, encoded)
+                queryset = queryset.filter(
+                    Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk})
+                )
+            rows += queryset[: size + 1 - len(rows)]
+            if len(rows) > size:
+                break
+
+        self.next_cursor = self.encode_cursor(rows[size - 1]) if len(rows) > size else None
+        return rows[:size]
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
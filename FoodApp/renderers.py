@@ -0,0 +1,67 @@
+import datetime
+import decimal
+import uuid
+
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to DRF's json-based renderer
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: MessagePackRenderer is only enabled when installed
+    msgpack = None
+
+
+def _default(value):
+    """Types orjson/msgpack do not encode natively, rendered as DRF's encoder would."""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (uuid.UUID, Promise)):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, datetime.timedelta):
+        return str(value.total_seconds())
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "__iter__"):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+class ORJSONRenderer(JSONRenderer):
+    """application/json through orjson: compact, UTF-8, same output as DRF's defaults.
+
+    Requests asking for indentation (``Accept: application/json; indent=2``) and
+    installs without orjson use the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """application/msgpack, negotiated through the Accept header."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, use_bin_type=True)
@@ -0,0 +1,53 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_use_primary = ContextVar("use_primary", default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def pin_to_primary():
+    _use_primary.set(True)
+
+
+def pinned_to_primary():
+    return _use_primary.get()
+
+
+@contextmanager
+def routing_scope(primary=False):
+    """Start a fresh pinning scope (one per request); writes inside it pin reads too.
+
+    ``routing_scope(primary=True)`` also wraps reads that fill shared caches: a
+    replica may not have the write that invalidated the entry yet, and caching
+    its answer would keep the stale value long after the replica catches up.
+    """
+    token = _use_primary.set(primary)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or _use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _use_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
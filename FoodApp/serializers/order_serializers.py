@@ -0,0 +1,169 @@
+from decimal import Decimal
+
+from django.db import transaction
+from rest_framework import serializers
+
+from ..models import (
+    Order,
+    OrderItems,
+    OrderItemOptions,
+    Options,
+    OptionGroups,
+    Product,
+    Restaurant,
+    User,
+)
+from ..services.analytics import record_order
+from ..services.kitchen import MAX_CLAIM, MAX_CLAIM_WAIT
+from ..services.reference_data import FINAL_STATUSES, PENDING_STATUS, order_statuses
+
+
+def _max_value(field):
+    """Largest value a DecimalField column holds (e.g. 99999999.99 for max_digits=10)."""
+    return Decimal(10) ** (field.max_digits - field.decimal_places) - Decimal(10) ** -field.decimal_places
+
+
+MAX_ORDER_TOTAL = _max_value(Order._meta.get_field("total_price"))
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Order
+        fields = "__all__"
+
+
+class OrderItemInputSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1, max_value=99)
+    options = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list, max_length=50
+    )
+
+
+class CreateOrderSerializer(serializers.Serializer):
+    user_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.filter(is_active=True))
+    restaurant_id = serializers.PrimaryKeyRelatedField(queryset=Restaurant.objects.all())
+    items = OrderItemInputSerializer(many=True, allow_empty=False, max_length=100)
+
+    def validate(self, attrs):
+        items = attrs["items"]
+        product_ids = {item["product_id"] for item in items}
+        option_ids = {option_id for item in items for option_id in item["options"]}
+
+        products = {
+            row["id"]: row
+            for row in Product.objects.filter(
+                restaurant_id=attrs["restaurant_id"], id__in=product_ids
+            ).values("id", "base_price")
+        }
+        groups = {
+            row["id"]: row
+            for row in OptionGroups.objects.filter(product_id__in=list(products)).values(
+                "id", "product_id", "name", "is_required", "min_selection", "max_selection"
+            )
+        }
+        groups_by_product = {}
+        for group in groups.values():
+            groups_by_product.setdefault(group["product_id"], []).append(group)
+        options = {
+            row["id"]: row
+            for row in Options.objects.filter(
+                id__in=option_ids, option_group_id__in=list(groups)
+            ).values("id", "option_group_id", "extra_price")
+        }
+
+        errors = {}
+        lines = []
+        total = Decimal("0")
+        for index, item in enumerate(items):
+            product = products.get(item["product_id"])
+            if product is None:
+                errors[index] = ["Produto não encontrado neste restaurante."]
+                continue
+
+            item_errors = []
+            selected = {}
+            unit_price = product["base_price"]
+            if len(set(item["options"])) != len(item["options"]):
+                errors[index] = ["Opções repetidas no mesmo item."]
+                continue
+            for option_id in item["options"]:
+                option = options.get(option_id)
+                if option is None or groups[option["option_group_id"]]["product_id"] != product["id"]:
+                    item_errors.append(f"Opção {option_id} inválida para este produto.")
+                    continue
+                selected[option["option_group_id"]] = selected.get(option["option_group_id"], 0) + 1
+                unit_price += option["extra_price"]
+
+            for group in groups_by_product.get(product["id"], []):
+                count = selected.get(group["id"], 0)
+                minimum = max(group["min_selection"], 1 if group["is_required"] else 0)
+                maximum = group["max_selection"]
+                if count < minimum:
+                    item_errors.append(
+                        f"Selecione pelo menos {minimum} opção(ões) em \"{group['name']}\"."
+                    )
+                elif maximum and count > maximum:
+                    item_errors.append(
+                        f"Selecione no máximo {maximum} opção(ões) em \"{group['name']}\"."
+                    )
+
+            if item_errors:
+                errors[index] = item_errors
+                continue
+            lines.append((product, item["quantity"], item["options"]))
+            total += unit_price * item["quantity"]
+
+        if errors:
+            raise serializers.ValidationError({"items": errors})
+        if total > MAX_ORDER_TOTAL:
+            raise serializers.ValidationError(
+                {"items": [f"O total do pedido excede o máximo de {MAX_ORDER_TOTAL}."]}
+            )
+
+        attrs["lines"] = lines
+        attrs["total_price"] = total
+        return attrs
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            order = Order.objects.create(
+                user_id=validated_data["user_id"],
+                restaurant_id=validated_data["restaurant_id"],
+                status_id=order_statuses.get(name=PENDING_STATUS).id,
+                total_price=validated_data["total_price"],
+            )
+            items = OrderItems.objects.bulk_create(
+                [
+                    OrderItems(
+                        order_id=order,
+                        product_id_id=product["id"],
+                        quantity=quantity,
+                        base_price=product["base_price"],
+                    )
+                    for product, quantity, _ in validated_data["lines"]
+                ]
+            )
+            OrderItemOptions.objects.bulk_create(
+                [
+                    OrderItemOptions(order_item_id=item, option_id_id=option_id)
+                    for item, (_, _, option_ids) in zip(items, validated_data["lines"])
+                    for option_id in option_ids
+                ]
+            )
+            record_order(order, validated_data["lines"])
+        return order
+
+
+class KitchenClaimSerializer(serializers.Serializer):
+    device = serializers.CharField(max_length=64)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_CLAIM, default=5)
+    wait = serializers.FloatField(min_value=0, max_value=MAX_CLAIM_WAIT, default=20)
+
+
+class KitchenAdvanceSerializer(serializers.Serializer):
+    device = serializers.CharField(max_length=64)
+    order_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=100
+    )
+    status = serializers.ChoiceField(choices=[PENDING_STATUS, *FINAL_STATUSES])
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+from ..models import Restaurant, RestaurantReview
+
+
+class RestaurantSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Restaurant
+        fields = "__all__"
+
+
+class RestaurantReviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RestaurantReview
+        fields = "__all__"
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0.1, max_value=50, default=5)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.now().date()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError("start deve ser anterior a end.")
+        if (end - start).days >= 366:
+            raise serializers.ValidationError("O período máximo é de 366 dias.")
+        attrs["start"], attrs["end"] = start, end
+        return attrs
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        start, end = attrs.get("start"), attrs.get("end")
+        if start and end and start > end:
+            raise serializers.ValidationError("start deve ser anterior a end.")
+        return attrs
@@ -0,0 +1,119 @@
+from datetime import datetime
+
+from django.utils.functional import cached_property
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .order_serializers import OrderSerializer
+from .restaurant_serializers import RestaurantReviewSerializer, RestaurantSerializer
+from .user_serializers import UserSerializer
+
+# Fields whose to_representation() returns a database value unchanged.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _datetime_converter(field):
+    """DateTimeField.to_representation with the field's timezone looked up once.
+
+    DRF resolves the current timezone for every value, which dominates the cost of
+    serializing timestamps; aware ISO-8601 values take this shortcut, anything else
+    goes through DRF.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime) or value.tzinfo is None:
+            return field.to_representation(value)
+        text = value.astimezone(field_timezone).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return convert
+
+
+class RowSerializer:
+    """Read-only fast path for a ModelSerializer with plain column fields.
+
+    Reads ``.values()`` rows instead of model instances and compiles the
+    serializer's fields once into (name, column, converter) triples; columns that
+    need no conversion are copied as-is. The output matches
+    ``serializer_class(instance).data``.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def fields(self):
+        fields = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*" or "." in field.source:
+                raise ValueError(
+                    f"{self.serializer_class.__name__}.{name} não é uma coluna simples."
+                )
+            fields.append((name, field.source, field))
+        return tuple(fields)
+
+    @cached_property
+    def columns(self):
+        return tuple(column for _, column, _ in self.fields)
+
+    @cached_property
+    def attnames(self):
+        opts = self.serializer_class.Meta.model._meta
+        return tuple((column, opts.get_field(column).attname) for column in self.columns)
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def instance_row(self, instance):
+        """The ``.values()`` row of an instance that is already loaded (e.g. cached)."""
+        return {column: getattr(instance, attname) for column, attname in self.attnames}
+
+    def converters(self):
+        """(name, column, convert) per field; convert is None for passthrough columns.
+
+        Built per call because timestamps are rendered in the active timezone.
+        """
+        converters = []
+        for name, column, field in self.fields:
+            if isinstance(field, PASSTHROUGH_FIELDS):
+                convert = None
+            elif isinstance(field, serializers.DateTimeField):
+                convert = _datetime_converter(field)
+            else:
+                convert = field.to_representation
+            converters.append((name, column, convert))
+        return converters
+
+    def to_representation(self, row):
+        return self.many([row])[0]
+
+    def many(self, rows):
+        converters = self.converters()
+        results = []
+        for row in rows:
+            data = {}
+            for name, column, convert in converters:
+                value = row[column]
+                data[name] = value if convert is None or value is None else convert(value)
+            results.append(data)
+        return results
+
+
+user_rows = RowSerializer(UserSerializer)
+restaurant_rows = RowSerializer(RestaurantSerializer)
+review_rows = RowSerializer(RestaurantReviewSerializer)
+order_rows = RowSerializer(OrderSerializer)
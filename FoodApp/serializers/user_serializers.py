@@ -1,8 +1,10 @@
 # serializers.py
 from rest_framework import serializers
-from ..models import User, Roles
-from django.contrib.auth.hashers import make_password
+from ..models import User
+from django.db.models.functions import Lower
 from django.utils import timezone
+from ..services.passwords import hash_password
+from ..services.reference_data import DEFAULT_ROLE, roles
 import re
 
 class UserSerializer(serializers.ModelSerializer):
@@ -20,13 +22,17 @@ class CreateUserSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             "username": {"min_length": 6, "max_length": 50},
             "phone": {"required": True},
-            "cpf": {"required": True},
+            "email": {"validators": []},
+            "cpf": {"required": True, "validators": []},
         }
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        value = value.lower().strip()
+        if self.context.get("skip_unique_checks"):
+            return value
+        if User.objects.annotate(email_lower=Lower("email")).filter(email_lower=value).exists():
             raise serializers.ValidationError("Este email já está cadastrado.")
-        return value.lower().strip()
+        return value
 
     def validate_username(self, value):
         if len(value) < 6:
@@ -64,7 +70,7 @@ class CreateUserSerializer(serializers.ModelSerializer):
         if calcular_digito(cpf, [11, 10, 9, 8, 7, 6, 5, 4, 3, 2]) != int(cpf[10]):
             raise serializers.ValidationError("CPF inválido.")
 
-        if User.objects.filter(cpf=cpf).exists():
+        if not self.context.get("skip_unique_checks") and User.objects.filter(cpf=cpf).exists():
             raise serializers.ValidationError("Este CPF já está cadastrado.")
 
         return cpf
@@ -103,14 +109,14 @@ class CreateUserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         password = validated_data.pop("password")
-        validated_data["password_hash"] = make_password(password)
-        validated_data["role"] = Roles.objects.get(id=2)
+        validated_data["password_hash"] = hash_password(password)
+        validated_data["role_id"] = roles.get(name=DEFAULT_ROLE).id
         user = User.objects.create(**validated_data)
         return user
 
 
 class EditUserSerializer(serializers.ModelSerializer):
-    password = serializers.CharField(write_only=True, min_length=8)
+    password = serializers.CharField(write_only=True, min_length=8, required=False)
 
     class Meta:
         model = User
@@ -140,10 +146,11 @@ class EditUserSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         instance.username = validated_data.get("username", instance.username)
         instance.phone = validated_data.get("phone", instance.phone)
-        password = validated_data.pop("password")
-        instance.password_hash = make_password(password)
+        update_fields = ["username", "phone", "updated_at"]
+        password = validated_data.pop("password", None)
+        if password:
+            instance.password_hash = hash_password(password)
+            update_fields.append("password_hash")
         instance.updated_at = timezone.now()
-        instance.save(
-            update_fields=["username", "phone", "password_hash", "updated_at"]
-        )
+        instance.save(update_fields=update_fields)
         return instance
\ No newline at end of file
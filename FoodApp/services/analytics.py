@@ -0,0 +1,308 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncHour
+
+from ..models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    Order,
+    OrderItems,
+    ProductDailyRollup,
+    RestaurantHourlyRollup,
+)
+from .reference_data import CANCELLED_STATUS, ReferenceDataMissing, order_statuses
+
+TOP_PRODUCTS = 10
+CENT = Decimal("0.01")
+
+_keeping_rollups = ContextVar("keeping_rollups", default=False)
+
+
+def _upsert(model, key_fields, counter_fields, rows):
+    """Add each row's counters to the matching rollup row, creating it when missing.
+
+    SQLite and PostgreSQL share the ``ON CONFLICT ... DO UPDATE`` syntax, so a whole
+    order is folded in with one statement per table; other backends loop.
+    """
+    if not rows:
+        return
+    if connection.vendor not in ("sqlite", "postgresql"):
+        for row in rows:
+            keys = {name: row[name] for name in key_fields}
+            deltas = {name: F(name) + row[name] for name in counter_fields}
+            if not model.objects.filter(**keys).update(**deltas):
+                model.objects.create(**row)
+        return
+
+    quote = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in (*key_fields, *counter_fields)]
+    table = quote(model._meta.db_table)
+    columns = ", ".join(quote(field.column) for field in fields)
+    placeholders = ", ".join(["(" + ", ".join(["%s"] * len(fields)) + ")"] * len(rows))
+    conflict = ", ".join(quote(model._meta.get_field(name).column) for name in key_fields)
+    updates = ", ".join(
+        f"{quote(column)} = {table}.{quote(column)} + excluded.{quote(column)}"
+        for column in (model._meta.get_field(name).column for name in counter_fields)
+    )
+    params = [
+        field.get_db_prep_save(row[field.name], connection)
+        for row in rows
+        for field in fields
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) VALUES {placeholders} "
+            f"ON CONFLICT ({conflict}) DO UPDATE SET {updates}",
+            params,
+        )
+
+
+def record_order(order, lines):
+    """Fold a freshly placed order into the hourly and per-product daily rollups.
+
+    ``lines`` are the ``(product, quantity, option_ids)`` tuples produced by
+    ``CreateOrderSerializer.validate``; revenue per product is counted at base price.
+    """
+    hour = order.created_at.replace(minute=0, second=0, microsecond=0)
+    _upsert(
+        RestaurantHourlyRollup,
+        ("restaurant_id", "hour"),
+        ("order_count", "revenue"),
+        [{
+            "restaurant_id": order.restaurant_id_id,
+            "hour": hour,
+            "order_count": 1,
+            "revenue": order.total_price,
+        }],
+    )
+
+    products = {}
+    for product, quantity, _ in lines:
+        row = products.setdefault(product["id"], {
+            "restaurant_id": order.restaurant_id_id,
+            "day": hour.date(),
+            "product_id": product["id"],
+            "quantity": 0,
+            "revenue": Decimal("0"),
+        })
+        row["quantity"] += quantity
+        row["revenue"] += product["base_price"] * quantity
+    _upsert(
+        ProductDailyRollup,
+        ("restaurant_id", "day", "product_id"),
+        ("quantity", "revenue"),
+        list(products.values()),
+    )
+
+
+def _subtract(model, key_fields, counter_fields, rows):
+    for row in rows:
+        model.objects.filter(**{name: row[name] for name in key_fields}).update(
+            **{name: F(name) - row[name] for name in counter_fields}
+        )
+
+
+def _order_rollup_rows(order_ids):
+    """The hourly and per-product daily rollup rows the given live orders add up to."""
+    orders = Order.objects.filter(id__in=order_ids)
+    hourly = list(
+        orders.annotate(hour=TruncHour("created_at", tzinfo=timezone.utc))
+        .values("restaurant_id", "hour")
+        .annotate(order_count=Count("id"), revenue=Sum("total_price"))
+        .order_by()
+    )
+    daily = [
+        {
+            "restaurant_id": row["order_id__restaurant_id"],
+            "day": row["day"],
+            "product_id": row["product_id"],
+            "quantity": row["units"],
+            "revenue": row["sales"],
+        }
+        for row in OrderItems.objects.filter(order_id__in=order_ids)
+        .annotate(day=TruncDate("order_id__created_at", tzinfo=timezone.utc))
+        .values("order_id__restaurant_id", "day", "product_id")
+        .annotate(units=Sum("quantity"), sales=Sum(F("base_price") * F("quantity")))
+        .order_by()
+    ]
+    return hourly, daily
+
+
+def _apply_orders(order_ids, apply):
+    hourly, daily = _order_rollup_rows(order_ids)
+    apply(RestaurantHourlyRollup, ("restaurant_id", "hour"), ("order_count", "revenue"), hourly)
+    apply(ProductDailyRollup, ("restaurant_id", "day", "product_id"), ("quantity", "revenue"), daily)
+
+
+def cancelled_status_id():
+    try:
+        return order_statuses.get(name=CANCELLED_STATUS).id
+    except ReferenceDataMissing:
+        return None
+
+
+def retract_orders(order_ids):
+    """Take orders back out of the rollups (cancelled or deleted)."""
+    if order_ids and not _keeping_rollups.get():
+        _apply_orders(order_ids, _subtract)
+
+
+def restore_orders(order_ids):
+    """Count orders again after they leave the cancelled status."""
+    if order_ids:
+        _apply_orders(order_ids, _upsert)
+
+
+def rollup_status_change(order_ids, before, after):
+    """Keep the rollups to non-cancelled orders when orders change status."""
+    if before == after:
+        return
+    cancelled = cancelled_status_id()
+    if after == cancelled:
+        retract_orders(order_ids)
+    elif before == cancelled:
+        restore_orders(order_ids)
+
+
+@contextmanager
+def keeping_rollups():
+    """Orders deleted inside the block stay counted: the archive moves them, it does
+    not remove them from the history the rollups describe."""
+    token = _keeping_rollups.set(True)
+    try:
+        yield
+    finally:
+        _keeping_rollups.reset(token)
+
+
+def rebuild_rollups(restaurant_id=None, batch_size=2000):
+    """Recompute the rollups from live and archived orders alike, cancelled ones aside."""
+    hourly = RestaurantHourlyRollup.objects.all()
+    daily = ProductDailyRollup.objects.all()
+    if restaurant_id is not None:
+        hourly = hourly.filter(restaurant_id=restaurant_id)
+        daily = daily.filter(restaurant_id=restaurant_id)
+
+    cancelled = cancelled_status_id()
+    with transaction.atomic():
+        hours = defaultdict(lambda: [0, Decimal("0")])
+        days = defaultdict(lambda: [0, Decimal("0")])
+        for order_model, item_model in ((Order, OrderItems), (ArchivedOrder, ArchivedOrderItem)):
+            orders = order_model.objects.all()
+            items = item_model.objects.all()
+            if cancelled is not None:
+                orders = orders.exclude(status_id=cancelled)
+                items = items.exclude(order_id__status_id=cancelled)
+            if restaurant_id is not None:
+                orders = orders.filter(restaurant_id=restaurant_id)
+                items = items.filter(order_id__restaurant_id=restaurant_id)
+            for row in (
+                orders.annotate(hour=TruncHour("created_at", tzinfo=timezone.utc))
+                .values("restaurant_id", "hour")
+                .annotate(order_count=Count("id"), revenue=Sum("total_price"))
+                .order_by()
+            ):
+                totals = hours[row["restaurant_id"], row["hour"]]
+                totals[0] += row["order_count"]
+                totals[1] += row["revenue"] or 0
+            for row in (
+                items.annotate(day=TruncDate("order_id__created_at", tzinfo=timezone.utc))
+                .values("order_id__restaurant_id", "day", "product_id")
+                .annotate(units=Sum("quantity"), sales=Sum(F("base_price") * F("quantity")))
+                .order_by()
+            ):
+                totals = days[row["order_id__restaurant_id"], row["day"], row["product_id"]]
+                totals[0] += row["units"]
+                totals[1] += row["sales"] or 0
+
+        hourly.delete()
+        daily.delete()
+        RestaurantHourlyRollup.objects.bulk_create(
+            [
+                RestaurantHourlyRollup(
+                    restaurant_id_id=restaurant, hour=hour, order_count=count, revenue=revenue
+                )
+                for (restaurant, hour), (count, revenue) in hours.items()
+            ],
+            batch_size=batch_size,
+        )
+        ProductDailyRollup.objects.bulk_create(
+            [
+                ProductDailyRollup(
+                    restaurant_id_id=restaurant,
+                    day=day,
+                    product_id_id=product,
+                    quantity=quantity,
+                    revenue=revenue,
+                )
+                for (restaurant, day, product), (quantity, revenue) in days.items()
+            ],
+            batch_size=batch_size,
+        )
+    return len(hours), len(days)
+
+
+def restaurant_dashboard(restaurant_id, start, end):
+    """Summarise the rollups for ``start``..``end`` (inclusive dates, UTC)."""
+    hours = (
+        RestaurantHourlyRollup.objects.filter(
+            restaurant_id=restaurant_id,
+            hour__gte=datetime.combine(start, time.min, tzinfo=timezone.utc),
+            hour__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=timezone.utc),
+        )
+        .values_list("hour", "order_count", "revenue")
+    )
+    daily = defaultdict(lambda: [0, Decimal("0")])
+    by_hour = [[0, Decimal("0")] for _ in range(24)]
+    for hour, count, revenue in hours:
+        day = daily[hour.date()]
+        day[0] += count
+        day[1] += revenue
+        by_hour[hour.hour][0] += count
+        by_hour[hour.hour][1] += revenue
+
+    top_products = (
+        ProductDailyRollup.objects.filter(
+            restaurant_id=restaurant_id, day__gte=start, day__lte=end
+        )
+        .values("product_id", "product_id__name")
+        .annotate(total_quantity=Sum("quantity"), total_revenue=Sum("revenue"))
+        .order_by("-total_quantity", "product_id")[:TOP_PRODUCTS]
+    )
+
+    total_orders = sum(count for count, _ in daily.values())
+    total_revenue = sum((revenue for _, revenue in daily.values()), Decimal("0"))
+    days = []
+    day = start
+    while day <= end:
+        count, revenue = daily.get(day, (0, Decimal("0")))
+        days.append({"day": day.isoformat(), "orders": count, "revenue": str(revenue.quantize(CENT))})
+        day += timedelta(days=1)
+
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "orders": total_orders,
+        "revenue": str(total_revenue.quantize(CENT)),
+        "average_ticket": str((total_revenue / total_orders if total_orders else Decimal("0")).quantize(CENT)),
+        "daily": days,
+        "by_hour": [
+            {"hour": hour, "orders": count, "revenue": str(revenue.quantize(CENT))}
+            for hour, (count, revenue) in enumerate(by_hour)
+        ],
+        "top_products": [
+            {
+                "product_id": row["product_id"],
+                "name": row["product_id__name"],
+                "quantity": row["total_quantity"],
+                "revenue": str(row["total_revenue"].quantize(CENT)),
+            }
+            for row in top_products
+        ],
+    }
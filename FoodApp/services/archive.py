@@ -0,0 +1,90 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import router, transaction
+from django.utils import timezone
+
+from ..models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    ArchivedOrderItemOption,
+    Order,
+    OrderItemOptions,
+    OrderItems,
+)
+from .analytics import keeping_rollups
+
+# Live model -> archive model. The archive tables repeat the live columns (same
+# attnames, same ids) and add the order's month.
+ARCHIVES = (
+    (Order, ArchivedOrder),
+    (OrderItems, ArchivedOrderItem),
+    (OrderItemOptions, ArchivedOrderItemOption),
+)
+
+
+def archive_cutoff(days=None, now=None):
+    if days is None:
+        days = settings.ORDER_ARCHIVE_AFTER_DAYS
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def archive_month(created_at):
+    return created_at.astimezone(dt_timezone.utc).date().replace(day=1)
+
+
+def _columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def archive_batch(cutoff, batch_size=500):
+    """Move up to ``batch_size`` of the oldest orders created before ``cutoff``, with
+    their items and options, into the archive tables. Returns how many orders moved.
+
+    Each batch is its own short transaction: the selected orders are locked
+    (FOR UPDATE where supported) so a concurrent status change cannot be lost, copied
+    with bulk inserts and deleted from the live tables. Orders always leave oldest
+    first, so every archived order is older than every live one.
+    """
+    order_columns, item_columns, option_columns = (_columns(live) for live, _ in ARCHIVES)
+    with transaction.atomic(using=router.db_for_write(Order)):
+        orders = list(
+            Order.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at", "id")
+            .select_for_update()
+            .values_list(*order_columns)[:batch_size]
+        )
+        if not orders:
+            return 0
+        orders = [dict(zip(order_columns, row)) for row in orders]
+        months = {order["id"]: archive_month(order["created_at"]) for order in orders}
+        items = [
+            dict(zip(item_columns, row))
+            for row in OrderItems.objects.filter(order_id__in=list(months)).values_list(*item_columns)
+        ]
+        item_months = {item["id"]: months[item["order_id_id"]] for item in items}
+        options = [
+            dict(zip(option_columns, row))
+            for row in OrderItemOptions.objects.filter(
+                order_item_id__in=list(item_months)
+            ).values_list(*option_columns)
+        ]
+
+        ArchivedOrder.objects.bulk_create(
+            [ArchivedOrder(**order, month=months[order["id"]]) for order in orders]
+        )
+        ArchivedOrderItem.objects.bulk_create(
+            [ArchivedOrderItem(**item, month=item_months[item["id"]]) for item in items]
+        )
+        ArchivedOrderItemOption.objects.bulk_create(
+            [
+                ArchivedOrderItemOption(**option, month=item_months[option["order_item_id_id"]])
+                for option in options
+            ]
+        )
+
+        with keeping_rollups():
+            OrderItemOptions.objects.filter(id__in=[option["id"] for option in options]).delete()
+            OrderItems.objects.filter(id__in=list(item_months)).delete()
+            Order.objects.filter(id__in=list(months)).delete()
+    return len(orders)
@@ -0,0 +1,62 @@
+import threading
+import time
+
+from django.core.cache import cache
+
+from ..routers import routing_scope
+
+
+def _initial_version():
+    # Counters start from the clock rather than 1: when the key is evicted or the
+    # cache flushed (or each process has its own LocMem cache), a restarted counter
+    # must not hand out a version, and so an ETag, already used for older data.
+    return time.time_ns()
+
+
+class CacheVersion:
+    def __init__(self, key):
+        self.key = key
+
+    def get(self):
+        version = cache.get(self.key)
+        if version is None:
+            initial = _initial_version()
+            cache.add(self.key, initial, timeout=None)
+            version = cache.get(self.key, initial)
+        return version
+
+    def bump(self):
+        try:
+            return cache.incr(self.key)
+        except ValueError:
+            cache.add(self.key, _initial_version(), timeout=None)
+            return cache.incr(self.key)
+
+
+class VersionedIndex:
+    version_key = None
+
+    def __init__(self):
+        self.version = CacheVersion(self.version_key)
+        self._lock = threading.RLock()
+        self._loaded_version = None
+        self.loaded = False
+
+    def _load(self):
+        raise NotImplementedError
+
+    def ensure_loaded(self):
+        current = self.version.get()
+        if not self.loaded or self._loaded_version != current:
+            with self._lock:
+                if not self.loaded or self._loaded_version != current:
+                    with routing_scope(primary=True):
+                        self._load()
+                    self.loaded = True
+                    self._loaded_version = current
+
+    def changed(self):
+        previous = self._loaded_version
+        new = self.version.bump()
+        if previous is not None and new == previous + 1:
+            self._loaded_version = new
@@ -0,0 +1,68 @@
+from ..models import RestaurantCategory
+from .cache_versions import VersionedIndex
+
+
+def iter_ids(bits, after=None):
+    if after is not None:
+        if after < 0:
+            raise ValueError("after deve ser >= 0")
+        # Ids above the highest set bit are empty anyway; clamping keeps a huge
+        # cursor from building an equally huge mask.
+        after = min(after, bits.bit_length())
+        bits &= ~((1 << (after + 1)) - 1)
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class CategoryIndex(VersionedIndex):
+    version_key = "category-index-version"
+
+    def __init__(self):
+        super().__init__()
+        self._bitsets = {}
+
+    def _load(self):
+        bitsets = {}
+        rows = RestaurantCategory.objects.values_list(
+            "food_category_id", "restaurant_id"
+        ).iterator(chunk_size=10000)
+        for category_id, restaurant_id in rows:
+            bitsets[category_id] = bitsets.get(category_id, 0) | (1 << restaurant_id)
+        self._bitsets = bitsets
+
+    def _apply(self, category_id, restaurant_id, present):
+        with self._lock:
+            if self.loaded:
+                bits = self._bitsets.get(category_id, 0)
+                if present:
+                    bits |= 1 << restaurant_id
+                else:
+                    bits &= ~(1 << restaurant_id)
+                self._bitsets[category_id] = bits
+            self.changed()
+
+    def add(self, category_id, restaurant_id):
+        self._apply(category_id, restaurant_id, True)
+
+    def remove(self, category_id, restaurant_id):
+        self._apply(category_id, restaurant_id, False)
+
+    def counts(self):
+        self.ensure_loaded()
+        return {category_id: bits.bit_count() for category_id, bits in self._bitsets.items()}
+
+    def intersection(self, category_ids):
+        self.ensure_loaded()
+        bitsets = self._bitsets
+        result = None
+        for category_id in category_ids:
+            bits = bitsets.get(category_id, 0)
+            result = bits if result is None else result & bits
+            if not result:
+                return 0
+        return result or 0
+
+
+category_index = CategoryIndex()
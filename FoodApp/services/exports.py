@@ -0,0 +1,210 @@
+import csv
+import json
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    ArchivedOrderItemOption,
+    Order,
+    OrderItemOptions,
+    OrderItems,
+    RestaurantReview,
+)
+from .reference_data import order_statuses
+
+EXPORT_CHUNK_SIZE = 1000
+# Lines are joined into blocks of roughly this many characters before being sent,
+# so the response is not written one tiny chunk per row.
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+ORDER_CSV_COLUMNS = (
+    "order_id", "created_at", "status", "user_id", "total_price",
+    "item_id", "product_id", "product_name", "quantity", "base_price", "options",
+)
+REVIEW_COLUMNS = ("review_id", "created_at", "user_id", "rating", "comment")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def _between(queryset, start, end):
+    if start:
+        queryset = queryset.filter(created_at__gte=datetime.combine(start, time.min, tzinfo=timezone.utc))
+    if end:
+        queryset = queryset.filter(
+            created_at__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        )
+    return queryset
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _status_name(status_id):
+    if status_id is None:
+        return None
+    try:
+        return order_statuses.get(id=status_id).name
+    except LookupError:
+        return None
+
+
+def order_records(restaurant_id, start=None, end=None, chunk_size=None):
+    """Yield a restaurant's orders, oldest first, each with its items and option names.
+
+    Archived orders come first (they are all older than the live ones). Orders are
+    read through a server-side cursor (``iterator``) and only one chunk is held at
+    a time: its items and options are fetched with one query each, so memory stays
+    flat and the query count grows with chunks, not orders.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    sources = (
+        (ArchivedOrder, ArchivedOrderItem, ArchivedOrderItemOption),
+        (Order, OrderItems, OrderItemOptions),
+    )
+    for order_model, item_model, option_model in sources:
+        orders = (
+            _between(order_model.objects.filter(restaurant_id=restaurant_id), start, end)
+            .order_by("created_at", "id")
+            .values("id", "created_at", "status_id", "user_id", "total_price")
+        )
+        for chunk in _chunks(orders.iterator(chunk_size=chunk_size), chunk_size):
+            yield from _with_items(chunk, item_model, option_model)
+
+
+def _with_items(chunk, item_model, option_model):
+    items = defaultdict(list)
+    options = defaultdict(list)
+    item_rows = list(
+        item_model.objects.filter(order_id__in=[order["id"] for order in chunk])
+        .order_by("id")
+        .values("id", "order_id", "product_id", "product_id__name", "quantity", "base_price")
+    )
+    for item_id, name in option_model.objects.filter(
+        order_item_id__in=[row["id"] for row in item_rows]
+    ).order_by("id").values_list("order_item_id", "option_id__name"):
+        options[item_id].append(name)
+    for row in item_rows:
+        items[row["order_id"]].append({
+            "item_id": row["id"],
+            "product_id": row["product_id"],
+            "product_name": row["product_id__name"],
+            "quantity": row["quantity"],
+            "base_price": row["base_price"],
+            "options": options[row["id"]],
+        })
+    for order in chunk:
+        yield {
+            "order_id": order["id"],
+            "created_at": order["created_at"],
+            "status": _status_name(order["status_id"]),
+            "user_id": order["user_id"],
+            "total_price": order["total_price"],
+            "items": items[order["id"]],
+        }
+
+
+def review_records(restaurant_id, start=None, end=None, chunk_size=None):
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    reviews = (
+        _between(RestaurantReview.objects.filter(restaurant_id=restaurant_id), start, end)
+        .order_by("created_at", "id")
+        .values_list("id", "created_at", "user_id", "rating", "comment")
+    )
+    for row in reviews.iterator(chunk_size=chunk_size):
+        yield dict(zip(REVIEW_COLUMNS, row))
+
+
+def _order_csv_rows(records):
+    """One CSV row per order line; orders without items still get one row."""
+    for record in records:
+        order = [record[column] for column in ORDER_CSV_COLUMNS[:5]]
+        if not record["items"]:
+            yield order + [None] * 6
+        for item in record["items"]:
+            yield order + [
+                item["item_id"], item["product_id"], item["product_name"],
+                item["quantity"], item["base_price"], "; ".join(item["options"]),
+            ]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _jsonl_lines(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def _buffered(lines, size=None):
+    size = size or EXPORT_BUFFER_SIZE
+    buffer, length = [], 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def export_lines(dataset, file_format, restaurant_id, start=None, end=None):
+    """Text blocks for ``dataset`` ("orders" or "reviews") as "csv" or "jsonl"."""
+    if dataset == "orders":
+        records = order_records(restaurant_id, start, end)
+        if file_format == "csv":
+            lines = _csv_lines(ORDER_CSV_COLUMNS, _order_csv_rows(records))
+        else:
+            lines = _jsonl_lines(records)
+    elif dataset == "reviews":
+        records = review_records(restaurant_id, start, end)
+        if file_format == "csv":
+            lines = _csv_lines(REVIEW_COLUMNS, (record.values() for record in records))
+        else:
+            lines = _jsonl_lines(records)
+    else:
+        raise ValueError(f"Exportação desconhecida: {dataset}")
+    return _buffered(lines)
+
+
+_DONE = object()
+
+
+async def aiter_blocks(blocks):
+    """Serve ``export_lines`` output from an async response, one block at a time.
+
+    Under ASGI, StreamingHttpResponse drains a sync iterator into a list before
+    sending anything; pulling each block through sync_to_async keeps memory flat.
+    The calls are thread sensitive, so the cursor stays on one connection.
+    """
+    pull = sync_to_async(next)
+    try:
+        while (block := await pull(blocks, _DONE)) is not _DONE:
+            yield block
+    finally:
+        await sync_to_async(blocks.close)()
@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.db.models import Q
+
+from ..models import Address
+from . import geohash
+from .cache_versions import VersionedIndex
+
+INDEX_PRECISION = 5
+DB_MAX_RANGES = 16
+
+
+class GeoIndex(VersionedIndex):
+    version_key = "geo-index-version"
+
+    def __init__(self, precision=INDEX_PRECISION):
+        super().__init__()
+        self.precision = precision
+        self._buckets = {}
+        self._cells = {}
+
+    def _load(self):
+        buckets = {}
+        cells = {}
+        rows = (
+            Address.objects.filter(
+                restaurant_id__isnull=False,
+                latitude__isnull=False,
+                longitude__isnull=False,
+            )
+            .values_list("id", "restaurant_id", "latitude", "longitude")
+            .iterator(chunk_size=5000)
+        )
+        for address_id, restaurant_id, lat, lng in rows:
+            lat, lng = float(lat), float(lng)
+            cell = geohash.encode(lat, lng, self.precision)
+            buckets.setdefault(cell, {})[address_id] = (lat, lng, restaurant_id)
+            cells[address_id] = cell
+        self._buckets = buckets
+        self._cells = cells
+
+    def _discard(self, address_id):
+        cell = self._cells.pop(address_id, None)
+        if cell is not None:
+            bucket = self._buckets.get(cell)
+            if bucket is not None:
+                bucket.pop(address_id, None)
+                if not bucket:
+                    del self._buckets[cell]
+
+    def update(self, address):
+        with self._lock:
+            if self.loaded:
+                self._discard(address.pk)
+                if (
+                    address.restaurant_id_id is not None
+                    and address.latitude is not None
+                    and address.longitude is not None
+                ):
+                    lat, lng = float(address.latitude), float(address.longitude)
+                    cell = geohash.encode(lat, lng, self.precision)
+                    self._buckets.setdefault(cell, {})[address.pk] = (lat, lng, address.restaurant_id_id)
+                    self._cells[address.pk] = cell
+            self.changed()
+
+    def remove(self, address_id):
+        with self._lock:
+            if self.loaded:
+                self._discard(address_id)
+            self.changed()
+
+    def _candidates_from_memory(self, boxes):
+        self.ensure_loaded()
+        buckets = self._buckets
+        cells = set().union(*(geohash.covering_cells(box, self.precision) for box in boxes))
+        for cell in cells:
+            bucket = buckets.get(cell)
+            if bucket:
+                yield from list(bucket.values())
+
+    def _candidates_from_db(self, boxes):
+        for precision in range(self.precision, 0, -1):
+            cells = set().union(*(geohash.covering_cells(box, precision) for box in boxes))
+            if len(cells) <= DB_MAX_RANGES:
+                break
+        cell_ranges = Q()
+        for cell in cells:
+            cell_ranges |= Q(geohash__gte=cell, geohash__lt=cell + "{")
+        in_boxes = Q()
+        for min_lat, min_lng, max_lat, max_lng in boxes:
+            in_boxes |= Q(latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+        rows = Address.objects.filter(
+            cell_ranges, in_boxes, restaurant_id__isnull=False
+        ).values_list("latitude", "longitude", "restaurant_id")
+        for lat, lng, restaurant_id in rows:
+            yield float(lat), float(lng), restaurant_id
+
+    def nearby(self, latitude, longitude, radius_km, limit):
+        boxes = geohash.bounding_boxes(latitude, longitude, radius_km)
+        if getattr(settings, "GEO_INDEX_IN_MEMORY", True):
+            candidates = self._candidates_from_memory(boxes)
+        else:
+            candidates = self._candidates_from_db(boxes)
+
+        best = {}
+        for lat, lng, restaurant_id in candidates:
+            distance = geohash.haversine_km(latitude, longitude, lat, lng)
+            if distance <= radius_km and distance < best.get(restaurant_id, radius_km + 1):
+                best[restaurant_id] = distance
+        return sorted(best.items(), key=lambda item: item[1])[:limit]
+
+
+geo_index = GeoIndex()
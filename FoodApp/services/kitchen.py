@@ -0,0 +1,124 @@
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from ..models import Order, OrderItemOptions, OrderItems
+from .analytics import rollup_status_change
+from .order_events import publish_status
+from .reference_data import FINAL_STATUSES, IN_PROGRESS_STATUS, PENDING_STATUS, order_statuses
+
+MAX_CLAIM = 20
+MAX_CLAIM_WAIT = 30
+
+
+def pending_queue(restaurant_id):
+    return Order.objects.filter(
+        restaurant_id=restaurant_id,
+        status_id=order_statuses.get(name=PENDING_STATUS).id,
+        claimed_by__isnull=True,
+    ).order_by("created_at", "id")
+
+
+def claim_orders(restaurant_id, device, limit):
+    """Move up to ``limit`` of the oldest pending orders to In Progress for ``device``.
+
+    PostgreSQL locks candidates with FOR UPDATE SKIP LOCKED, so concurrent tablets
+    take different rows without waiting on each other. Without SKIP LOCKED (SQLite)
+    the claim is a single UPDATE over a LIMIT subquery: it holds the database write
+    lock, so claims are serialized and a row can only be won once. Rows are then
+    read back by the claim's own (device, timestamp) mark.
+    """
+    in_progress = order_statuses.get(name=IN_PROGRESS_STATUS).id
+    now = timezone.now()
+    claim = {"status_id": in_progress, "claimed_by": device, "claimed_at": now, "updated_at": now}
+    db = router.db_for_write(Order)
+
+    with transaction.atomic(using=db):
+        if connections[db].features.has_select_for_update_skip_locked:
+            ids = list(
+                pending_queue(restaurant_id)
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:limit]
+            )
+            Order.objects.filter(id__in=ids).update(**claim)
+        else:
+            Order.objects.filter(
+                id__in=pending_queue(restaurant_id).values("id")[:limit]
+            ).update(**claim)
+            ids = list(
+                Order.objects.filter(claimed_by=device, claimed_at=now)
+                .order_by("created_at", "id")
+                .values_list("id", flat=True)
+            )
+        for order_id in ids:
+            publish_status(order_id, in_progress)
+    return ids
+
+
+def advance_orders(restaurant_id, device, order_ids, status_name):
+    """Apply one transition to every listed order this device holds, in a single UPDATE.
+
+    Final statuses finish the orders; Pending releases them back to the queue.
+    Returns the ids that changed (orders claimed by another device are skipped).
+    """
+    if status_name not in (PENDING_STATUS, *FINAL_STATUSES):
+        raise ValueError(f"Transição inválida para {status_name}.")
+    target = order_statuses.get(name=status_name).id
+    now = timezone.now()
+    changes = {"status_id": target, "updated_at": now}
+    if status_name == PENDING_STATUS:
+        changes.update(claimed_by=None, claimed_at=None)
+
+    in_progress = order_statuses.get(name=IN_PROGRESS_STATUS).id
+    with transaction.atomic(using=router.db_for_write(Order)):
+        Order.objects.filter(
+            id__in=order_ids,
+            restaurant_id=restaurant_id,
+            claimed_by=device,
+            status_id=in_progress,
+        ).update(**changes)
+        ids = list(
+            Order.objects.filter(id__in=order_ids, status_id=target, updated_at=now)
+            .values_list("id", flat=True)
+        )
+        rollup_status_change(ids, in_progress, target)
+        for order_id in ids:
+            publish_status(order_id, target)
+    return ids
+
+
+def kitchen_orders(order_ids):
+    orders = {
+        row["id"]: {**row, "total_price": str(row["total_price"]), "items": []}
+        for row in Order.objects.filter(id__in=order_ids)
+        .order_by("created_at", "id")
+        .values("id", "user_id", "total_price", "claimed_by", "claimed_at", "created_at")
+    }
+    items = {}
+    for row in OrderItems.objects.filter(order_id__in=list(orders)).values(
+        "id", "order_id", "quantity", "product_id", "product_id__name"
+    ):
+        item = {
+            "product_id": row["product_id"],
+            "name": row["product_id__name"],
+            "quantity": row["quantity"],
+            "options": [],
+        }
+        items[row["id"]] = item
+        orders[row["order_id"]]["items"].append(item)
+    for row in OrderItemOptions.objects.filter(order_item_id__in=list(items)).values(
+        "order_item_id", "option_id__name"
+    ):
+        items[row["order_item_id"]]["options"].append(row["option_id__name"])
+    return list(orders.values())
+
+
+def kitchen_snapshot(restaurant_id, device):
+    claimed = Order.objects.filter(
+        restaurant_id=restaurant_id,
+        claimed_by=device,
+        status_id=order_statuses.get(name=IN_PROGRESS_STATUS).id,
+    ).values_list("id", flat=True)
+    return {
+        "pending": pending_queue(restaurant_id).count(),
+        "claimed": kitchen_orders(list(claimed)),
+    }
@@ -0,0 +1,75 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..models import Options, OptionGroups, Product, Restaurant
+from ..routers import routing_scope
+from .cache_versions import CacheVersion
+
+PRODUCT_FIELDS = ("id", "name", "description", "photo", "base_price")
+GROUP_FIELDS = ("id", "product_id", "name", "is_required", "min_selection", "max_selection")
+OPTION_FIELDS = ("id", "option_group_id", "name", "extra_price")
+
+
+def menu_version(restaurant_id):
+    return CacheVersion(f"menu-version:{restaurant_id}")
+
+
+def build_menu(restaurant_id):
+    products = list(
+        Product.objects.filter(restaurant_id=restaurant_id)
+        .order_by("name", "id")
+        .values(*PRODUCT_FIELDS)
+    )
+    if not products and not Restaurant.objects.filter(id=restaurant_id).exists():
+        return None
+
+    groups_by_product = {}
+    groups_by_id = {}
+    if products:
+        groups = (
+            OptionGroups.objects.filter(product_id__restaurant_id=restaurant_id)
+            .order_by("id")
+            .values(*GROUP_FIELDS)
+        )
+        for group in groups:
+            group["options"] = []
+            groups_by_id[group["id"]] = group
+            groups_by_product.setdefault(group.pop("product_id"), []).append(group)
+
+    if groups_by_id:
+        options = (
+            Options.objects.filter(option_group_id__product_id__restaurant_id=restaurant_id)
+            .order_by("id")
+            .values(*OPTION_FIELDS)
+        )
+        for option in options:
+            groups_by_id[option.pop("option_group_id")]["options"].append(option)
+
+    for product in products:
+        product["option_groups"] = groups_by_product.get(product["id"], [])
+
+    return {"restaurant_id": restaurant_id, "products": products}
+
+
+def get_menu_json(restaurant_id):
+    version = menu_version(restaurant_id).get()
+    key = f"menu:{restaurant_id}:{version}"
+    blob = cache.get(key)
+    if blob is not None:
+        return blob
+
+    with routing_scope(primary=True):
+        menu = build_menu(restaurant_id)
+    if menu is None:
+        return None
+    blob = json.dumps(menu, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+    cache.set(key, blob, timeout=getattr(settings, "MENU_CACHE_TIMEOUT", 60 * 60))
+    return blob
+
+
+def invalidate_menu(restaurant_id):
+    if restaurant_id is not None:
+        menu_version(restaurant_id).bump()
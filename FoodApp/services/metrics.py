@@ -0,0 +1,131 @@
+import bisect
+import re
+import threading
+from collections import Counter
+from time import perf_counter
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def sql_shape(sql):
+    """Collapse literals and IN lists so repeated queries compare equal."""
+    return _LITERAL.sub("?", _IN_LIST.sub("(...)", sql))
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` hook that counts and times queries for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold):
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            running += count
+            yield bound, running
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+class RequestMetrics:
+    """Per-process aggregates; each worker exposes its own series."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter()
+            self.durations = {}
+            self.queries = {}
+            self.db_seconds = Counter()
+            self.n_plus_one = Counter()
+
+    def record(self, route, method, status, duration, recorder, n_plus_one):
+        with self._lock:
+            self.requests[(route, method, status)] += 1
+            self.durations.setdefault((route, method), Histogram(DURATION_BUCKETS)).observe(duration)
+            self.queries.setdefault((route, method), Histogram(QUERY_BUCKETS)).observe(recorder.count)
+            self.db_seconds[(route, method)] += recorder.duration
+            if n_plus_one:
+                self.n_plus_one[(route, method)] += 1
+
+    def _histogram(self, lines, name, help_text, series):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (route, method), histogram in sorted(series.items()):
+            labels = (("route", route), ("method", method))
+            for bound, count in histogram.cumulative():
+                lines.append(f"{name}_bucket{{{_labels((*labels, ('le', bound)))}}} {count}")
+            lines.append(f"{name}_sum{{{_labels(labels)}}} {histogram.total:.6f}")
+            lines.append(f"{name}_count{{{_labels(labels)}}} {histogram.count}")
+
+    def _counter(self, lines, name, help_text, series, names):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for key, value in sorted(series.items()):
+            number = f"{value:.6f}" if isinstance(value, float) else value
+            lines.append(f"{name}{{{_labels(zip(names, key))}}} {number}")
+
+    def render(self, gauges=()):
+        lines = []
+        with self._lock:
+            self._counter(
+                lines, "foodapp_http_requests_total", "Requests handled, by route.",
+                self.requests, ("route", "method", "status"),
+            )
+            self._histogram(
+                lines, "foodapp_http_request_duration_seconds", "Request latency.", self.durations
+            )
+            self._histogram(lines, "foodapp_db_queries_per_request", "SQL queries per request.", self.queries)
+            self._counter(
+                lines, "foodapp_db_time_seconds_total", "Time spent in SQL, by route.",
+                self.db_seconds, ("route", "method"),
+            )
+            self._counter(
+                lines, "foodapp_n_plus_one_requests_total",
+                "Requests that repeated one SQL shape above the threshold.",
+                self.n_plus_one, ("route", "method"),
+            )
+        for name, help_text, value in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .reference_data import order_statuses
+
+
+class Subscription:
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    async def get(self):
+        return await self.queue.get()
+
+    def deliver(self, message):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker:
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.deliver(message)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._channels.values())
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    path = getattr(settings, "ORDER_EVENTS_BROKER", "FoodApp.services.order_events.InProcessBroker")
+    return import_string(path)()
+
+
+def order_channel(order_id):
+    return f"order:{order_id}"
+
+
+def kitchen_channel(restaurant_id):
+    return f"kitchen:{restaurant_id}"
+
+
+def status_message(order_id, status_id):
+    name = order_statuses.get(id=status_id).name if status_id is not None else None
+    return {"order_id": order_id, "status_id": status_id, "status": name}
+
+
+def publish_status(order_id, status_id):
+    def send():
+        get_broker().publish(order_channel(order_id), status_message(order_id, status_id))
+
+    transaction.on_commit(send)
+
+
+def publish_new_order(restaurant_id, order_id):
+    def send():
+        get_broker().publish(kitchen_channel(restaurant_id), {"order_id": order_id})
+
+    transaction.on_commit(send)
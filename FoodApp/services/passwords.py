@@ -0,0 +1,66 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+_process_pool = None
+_thread_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    django.setup()
+
+
+def process_pool_size():
+    return getattr(settings, "PASSWORD_HASHING_PROCESSES", None) or os.cpu_count() or 1
+
+
+def thread_pool_size():
+    return getattr(settings, "PASSWORD_HASHING_THREADS", None) or os.cpu_count() or 1
+
+
+def process_pool():
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=process_pool_size(), initializer=_init_worker
+            )
+        return _process_pool
+
+
+def thread_pool():
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=thread_pool_size(), thread_name_prefix="password-hashing"
+            )
+        return _thread_pool
+
+
+def hash_password(password):
+    """Hash on the shared pool and wait for the result.
+
+    The caller blocks exactly as if it called make_password itself; what the pool
+    adds is a cap on how many hashes run at once across all request threads, so a
+    burst of signups cannot take every core away from other requests.
+    """
+    return thread_pool().submit(make_password, password).result()
+
+
+async def ahash_password(password):
+    return await asyncio.wrap_future(thread_pool().submit(make_password, password))
+
+
+def hash_many(passwords):
+    passwords = list(passwords)
+    if len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (process_pool_size() * 4))
+    return list(process_pool().map(make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,81 @@
+from django.db.models import Case, Count, Exists, F, FloatField, OuterRef, Q, Sum, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
+
+from ..models import Restaurant, RestaurantReview
+
+STARS = range(1, 6)
+STAR_FIELDS = {star: f"rating_{star}_count" for star in STARS}
+
+
+def apply_rating_change(restaurant_id, count_delta, sum_delta, star_deltas):
+    new_count = F("rating_count") + count_delta
+    new_sum = F("rating_sum") + sum_delta
+    updates = {
+        "rating_count": new_count,
+        "rating_sum": new_sum,
+        "rating_avg": Case(
+            When(GreaterThan(new_count, 0), then=Cast(new_sum, FloatField()) / new_count),
+            default=0.0,
+            output_field=FloatField(),
+        ),
+    }
+    for star, delta in star_deltas.items():
+        if delta and star in STAR_FIELDS:
+            updates[STAR_FIELDS[star]] = F(STAR_FIELDS[star]) + delta
+    Restaurant.objects.filter(id=restaurant_id).update(**updates)
+
+
+def review_changed(before, after):
+    changes = {}
+    for sign, state in ((-1, before), (1, after)):
+        if state is None:
+            continue
+        restaurant_id, rating = state
+        change = changes.setdefault(restaurant_id, {"count": 0, "sum": 0, "stars": {}})
+        change["count"] += sign
+        change["sum"] += sign * rating
+        change["stars"][rating] = change["stars"].get(rating, 0) + sign
+
+    for restaurant_id, change in changes.items():
+        if change["count"] or change["sum"] or any(change["stars"].values()):
+            apply_rating_change(restaurant_id, change["count"], change["sum"], change["stars"])
+
+
+def rebuild_ratings(batch_size=1000):
+    stats = (
+        RestaurantReview.objects.order_by()
+        .values("restaurant_id")
+        .annotate(
+            count=Count("id"),
+            total=Sum("rating"),
+            **{f"stars_{star}": Count("id", filter=Q(rating=star)) for star in STARS},
+        )
+    )
+    fields = ["rating_count", "rating_sum", "rating_avg", *STAR_FIELDS.values()]
+    batch = []
+    updated = 0
+    for row in stats.iterator(chunk_size=batch_size):
+        restaurant = Restaurant(
+            id=row["restaurant_id"],
+            rating_count=row["count"],
+            rating_sum=row["total"],
+            rating_avg=row["total"] / row["count"],
+        )
+        for star, field in STAR_FIELDS.items():
+            setattr(restaurant, field, row[f"stars_{star}"])
+        batch.append(restaurant)
+        if len(batch) >= batch_size:
+            Restaurant.objects.bulk_update(batch, fields)
+            updated += len(batch)
+            batch = []
+    if batch:
+        Restaurant.objects.bulk_update(batch, fields)
+        updated += len(batch)
+
+    cleared = (
+        Restaurant.objects.filter(rating_count__gt=0)
+        .exclude(Exists(RestaurantReview.objects.filter(restaurant_id=OuterRef("pk"))))
+        .update(rating_count=0, rating_sum=0, rating_avg=0, **{field: 0 for field in STAR_FIELDS.values()})
+    )
+    return updated, cleared
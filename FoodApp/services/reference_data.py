@@ -0,0 +1,90 @@
+import logging
+from collections import namedtuple
+from types import MappingProxyType
+
+from django.db import DatabaseError
+
+from ..models import OrderStatus, Roles
+from .cache_versions import VersionedIndex
+
+logger = logging.getLogger(__name__)
+
+Reference = namedtuple("Reference", ["id", "name"])
+
+
+class ReferenceDataMissing(LookupError):
+    """A role or order status the code depends on is not in the database.
+
+    Views answer 503: the request is fine, the deployment is missing its fixtures
+    (``manage.py loaddata roles orderStatus``).
+    """
+
+
+class ReferenceRegistry(VersionedIndex):
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f"reference-data:{model._meta.label_lower}"
+        super().__init__()
+        self._by_id = MappingProxyType({})
+        self._by_name = MappingProxyType({})
+
+    def _load(self):
+        entries = [Reference(*row) for row in self.model.objects.values_list("id", "name")]
+        self._by_id = MappingProxyType({entry.id: entry for entry in entries})
+        self._by_name = MappingProxyType({entry.name: entry for entry in entries})
+
+    def get(self, id=None, name=None):
+        self.ensure_loaded()
+        entry = self._by_id.get(id) if id is not None else self._by_name.get(name)
+        if entry is None:
+            raise ReferenceDataMissing(
+                f"{self.model.__name__} não encontrado: {id if id is not None else name}"
+            )
+        return entry
+
+    def all(self):
+        self.ensure_loaded()
+        return tuple(self._by_id.values())
+
+    def refresh(self):
+        with self._lock:
+            self.loaded = False
+            self.version.bump()
+
+
+roles = ReferenceRegistry(Roles)
+order_statuses = ReferenceRegistry(OrderStatus)
+
+DEFAULT_ROLE = "user"
+PENDING_STATUS = "Pending"
+IN_PROGRESS_STATUS = "In Progress"
+CANCELLED_STATUS = "Cancelled"
+FINAL_STATUSES = ("Delivered", CANCELLED_STATUS)
+
+
+REQUIRED_REFERENCES = (
+    (roles, (DEFAULT_ROLE,)),
+    (order_statuses, (PENDING_STATUS, IN_PROGRESS_STATUS, *FINAL_STATUSES)),
+)
+
+
+def missing_references():
+    missing = []
+    for registry, names in REQUIRED_REFERENCES:
+        loaded = {entry.name for entry in registry.all()}
+        missing.extend(f"{registry.model.__name__} {name}" for name in names if name not in loaded)
+    return missing
+
+
+def warm_reference_data():
+    try:
+        missing = missing_references()
+    except DatabaseError:
+        logger.warning("Reference data not loaded at startup; it will load on first use.")
+        return
+    if missing:
+        logger.error(
+            "Missing reference data (%s); requests that need it answer 503. "
+            "Load it with: manage.py loaddata roles orderStatus",
+            ", ".join(missing),
+        )
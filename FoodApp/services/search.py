@@ -0,0 +1,100 @@
+from django.db import connections, router
+from django.db.models import Q
+
+from ..models import FoodCategory, Product, Restaurant, SearchEntry
+from .text import normalize, tokens
+
+SOURCES = {
+    Restaurant: SearchEntry.KIND_RESTAURANT,
+    Product: SearchEntry.KIND_PRODUCT,
+    FoodCategory: SearchEntry.KIND_CATEGORY,
+}
+MAX_TERMS = 8
+
+
+def entry_fields(instance):
+    body = getattr(instance, "description", None) or ""
+    return {
+        "title": instance.name,
+        "body": body,
+        "search_text": normalize(f"{instance.name} {body}"),
+    }
+
+
+def index_object(instance):
+    SearchEntry.objects.update_or_create(
+        kind=SOURCES[type(instance)], object_id=instance.pk, defaults=entry_fields(instance)
+    )
+
+
+def unindex_object(instance):
+    SearchEntry.objects.filter(kind=SOURCES[type(instance)], object_id=instance.pk).delete()
+
+
+def rebuild_index(batch_size=2000):
+    SearchEntry.objects.all().delete()
+    total = 0
+    for model, kind in SOURCES.items():
+        batch = []
+        for instance in model.objects.iterator(chunk_size=batch_size):
+            batch.append(SearchEntry(kind=kind, object_id=instance.pk, **entry_fields(instance)))
+            if len(batch) >= batch_size:
+                SearchEntry.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def _search_sqlite(connection, terms, limit):
+    match = " ".join(f'"{term}"*' for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT e.kind, e.object_id, e.title, -bm25("FoodApp_searchentry_fts", 10.0, 1.0) AS score '
+            'FROM "FoodApp_searchentry_fts" '
+            'JOIN "FoodApp_searchentry" e ON e.id = "FoodApp_searchentry_fts".rowid '
+            'WHERE "FoodApp_searchentry_fts" MATCH %s ORDER BY score DESC LIMIT %s',
+            [match, limit],
+        )
+        return cursor.fetchall()
+
+
+def _search_postgres(connection, terms, limit):
+    query = " & ".join(f"{term}:*" for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT kind, object_id, title, '
+            "ts_rank(to_tsvector('simple', search_text), to_tsquery('simple', %s)) "
+            "+ CASE WHEN search_text LIKE %s THEN 1 ELSE 0 END AS score "
+            'FROM "FoodApp_searchentry" '
+            "WHERE to_tsvector('simple', search_text) @@ to_tsquery('simple', %s) "
+            "ORDER BY score DESC LIMIT %s",
+            [query, f"{terms[0]}%", query, limit],
+        )
+        return cursor.fetchall()
+
+
+def _search_fallback(terms, limit):
+    condition = Q()
+    for term in terms:
+        condition &= Q(search_text__contains=term)
+    rows = SearchEntry.objects.filter(condition).values_list("kind", "object_id", "title")[:limit]
+    return [(*row, 0.0) for row in rows]
+
+
+def search(query, limit=20):
+    terms = tokens(query)[:MAX_TERMS]
+    if not terms:
+        return []
+    connection = connections[router.db_for_read(SearchEntry)]
+    if connection.vendor == "sqlite":
+        rows = _search_sqlite(connection, terms, limit)
+    elif connection.vendor == "postgresql":
+        rows = _search_postgres(connection, terms, limit)
+    else:
+        rows = _search_fallback(terms, limit)
+    return [
+        {"type": kind, "id": object_id, "name": title, "score": round(score, 4)}
+        for kind, object_id, title, score in rows
+    ]
@@ -0,0 +1,13 @@
+import re
+import unicodedata
+
+TOKEN = re.compile(r"\w+")
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokens(text):
+    return TOKEN.findall(normalize(text))
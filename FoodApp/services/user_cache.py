@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from ..models import User
+from ..routers import routing_scope
+
+_MISSING = object()
+
+
+class LocalLRU:
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class UserCache:
+    def __init__(self):
+        self.local = LocalLRU(
+            maxsize=getattr(settings, "USER_CACHE_LOCAL_SIZE", 10000),
+            ttl=getattr(settings, "USER_CACHE_LOCAL_TTL", 5),
+        )
+        self._counters = {"local_hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return caches[getattr(settings, "USER_CACHE_ALIAS", "default")]
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def key(self, user_id):
+        return f"user:{user_id}"
+
+    def get(self, user_id):
+        key = self.key(user_id)
+        user = self.local.get(key)
+        if user is not _MISSING:
+            self._count("local_hits")
+            return user
+
+        user = self.backend.get(key)
+        if user is not None:
+            self._count("shared_hits")
+        else:
+            self._count("misses")
+            with routing_scope(primary=True):
+                user = User.objects.get(id=user_id)
+            self.backend.set(key, user, timeout=getattr(settings, "USER_CACHE_TTL", 300))
+        self.local.set(key, user)
+        return user
+
+    async def aget(self, user_id):
+        """``get`` for async views: the shared cache and the database are awaited."""
+        key = self.key(user_id)
+        user = self.local.get(key)
+        if user is not _MISSING:
+            self._count("local_hits")
+            return user
+
+        user = await self.backend.aget(key)
+        if user is not None:
+            self._count("shared_hits")
+        else:
+            self._count("misses")
+            with routing_scope(primary=True):
+                user = await User.objects.aget(id=user_id)
+            await self.backend.aset(key, user, timeout=getattr(settings, "USER_CACHE_TTL", 300))
+        self.local.set(key, user)
+        return user
+
+    def invalidate(self, user_id):
+        key = self.key(user_id)
+        self.local.delete(key)
+        self.backend.delete(key)
+        self._count("invalidations")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["local_hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        stats["local_size"] = len(self.local)
+        return stats
+
+
+user_cache = UserCache()
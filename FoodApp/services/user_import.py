@@ -0,0 +1,109 @@
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from ..models import User
+from ..serializers.user_serializers import CreateUserSerializer
+from .passwords import hash_many
+from .reference_data import DEFAULT_ROLE, roles
+
+DEFAULT_CHUNK_SIZE = 1000
+# Rows with errors beyond the first ones are only counted ("failed"), so a bad
+# file does not produce a response as large as the upload.
+MAX_REPORTED_ERRORS = 100
+
+
+def _chunks(rows, size):
+    rows = iter(enumerate(rows, start=1))
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _existing(emails, cpfs):
+    rows = (
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(Q(email_lower__in=emails) | Q(cpf__in=cpfs))
+        .values_list("email_lower", "cpf")
+    )
+    taken_emails, taken_cpfs = set(), set()
+    for email, cpf in rows:
+        taken_emails.add(email)
+        taken_cpfs.add(cpf)
+    return taken_emails, taken_cpfs
+
+
+def _insert(candidates, role_id):
+    users = [
+        User(role_id=role_id, password_hash=password_hash, **data)
+        for _, data, password_hash in candidates
+    ]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+        return len(users), []
+    except IntegrityError:
+        pass
+
+    created, errors = 0, []
+    for (row, _, _), user in zip(candidates, users):
+        try:
+            with transaction.atomic():
+                user.pk = None
+                user.save(force_insert=True)
+            created += 1
+        except IntegrityError:
+            errors.append({"row": row, "errors": {"non_field_errors": ["Email ou CPF já cadastrado."]}})
+    return created, errors
+
+
+def _report(summary, errors):
+    summary["failed"] += len(errors)
+    room = MAX_REPORTED_ERRORS - len(summary["errors"])
+    if room > 0:
+        summary["errors"].extend(sorted(errors, key=lambda error: error["row"])[:room])
+
+
+def import_users(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    role_id = roles.get(name=DEFAULT_ROLE).id
+    summary = {"created": 0, "failed": 0, "errors": []}
+
+    for chunk in _chunks(rows, chunk_size):
+        valid = []
+        chunk_errors = []
+        for row, data in chunk:
+            serializer = CreateUserSerializer(data=data, context={"skip_unique_checks": True})
+            if serializer.is_valid():
+                valid.append((row, dict(serializer.validated_data)))
+            else:
+                chunk_errors.append({"row": row, "errors": serializer.errors})
+
+        taken_emails, taken_cpfs = _existing(
+            {data["email"] for _, data in valid},
+            {data["cpf"] for _, data in valid if data.get("cpf")},
+        )
+        accepted = []
+        for row, data in valid:
+            errors = {}
+            if data["email"] in taken_emails:
+                errors["email"] = ["Este email já está cadastrado."]
+            if data.get("cpf") and data["cpf"] in taken_cpfs:
+                errors["cpf"] = ["Este CPF já está cadastrado."]
+            if errors:
+                chunk_errors.append({"row": row, "errors": errors})
+                continue
+            taken_emails.add(data["email"])
+            if data.get("cpf"):
+                taken_cpfs.add(data["cpf"])
+            accepted.append((row, data))
+
+        hashes = hash_many(data.pop("password") for _, data in accepted)
+        created, errors = _insert(
+            [(row, data, password_hash) for (row, data), password_hash in zip(accepted, hashes)],
+            role_id,
+        )
+        summary["created"] += created
+        # Chunks come in row order, so the reported errors are the first ones.
+        _report(summary, chunk_errors + errors)
+    return summary
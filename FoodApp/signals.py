@@ -0,0 +1,237 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Address,
+    FoodCategory,
+    Options,
+    OptionGroups,
+    Order,
+    Product,
+    Restaurant,
+    RestaurantCategory,
+    RestaurantReview,
+    Roles,
+    OrderStatus,
+    User,
+)
+from .services.analytics import cancelled_status_id, retract_orders, rollup_status_change
+from .services.category_index import category_index
+from .services.geo_index import geo_index
+from .services.menu_cache import invalidate_menu
+from .services.order_events import publish_new_order, publish_status
+from .services.ratings import review_changed
+from .services.reference_data import order_statuses, roles
+from .services.search import index_object, unindex_object
+from .services.user_cache import user_cache
+
+
+# Only restaurant addresses are in the geo index; customer addresses, the vast
+# majority of writes, leave its version alone.
+@receiver(pre_save, sender=Address)
+def address_loading(sender, instance, **kwargs):
+    instance._restaurant_before = None
+    if instance.pk is not None:
+        instance._restaurant_before = (
+            Address.objects.filter(pk=instance.pk).values_list("restaurant_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Address)
+def address_saved(sender, instance, **kwargs):
+    if instance.restaurant_id_id is not None or getattr(instance, "_restaurant_before", None) is not None:
+        transaction.on_commit(partial(geo_index.update, instance))
+
+
+@receiver(post_delete, sender=Address)
+def address_deleted(sender, instance, **kwargs):
+    if instance.restaurant_id_id is not None:
+        transaction.on_commit(partial(geo_index.remove, instance.pk))
+
+
+def invalidate_menus(*restaurant_ids):
+    # After commit: a reader refilling the cache before then would store the old menu.
+    for restaurant_id in set(restaurant_ids) - {None}:
+        transaction.on_commit(partial(invalidate_menu, restaurant_id))
+
+
+def group_restaurant(product_id):
+    return Product.objects.filter(pk=product_id).values_list("restaurant_id", flat=True).first()
+
+
+def option_restaurant(option_group_id):
+    return (
+        OptionGroups.objects.filter(pk=option_group_id)
+        .values_list("product_id__restaurant_id", flat=True)
+        .first()
+    )
+
+
+# A product, group or option moved to another restaurant changes both menus, so
+# the restaurant it belonged to is remembered before the save.
+@receiver(pre_save, sender=Product)
+def product_loading(sender, instance, **kwargs):
+    instance._restaurant_before = None
+    if instance.pk is not None:
+        instance._restaurant_before = (
+            Product.objects.filter(pk=instance.pk).values_list("restaurant_id", flat=True).first()
+        )
+
+
+@receiver(pre_save, sender=OptionGroups)
+def option_group_loading(sender, instance, **kwargs):
+    instance._restaurant_before = None
+    if instance.pk is not None:
+        instance._restaurant_before = (
+            OptionGroups.objects.filter(pk=instance.pk)
+            .values_list("product_id__restaurant_id", flat=True)
+            .first()
+        )
+
+
+@receiver(pre_save, sender=Options)
+def option_loading(sender, instance, **kwargs):
+    instance._restaurant_before = None
+    if instance.pk is not None:
+        instance._restaurant_before = (
+            Options.objects.filter(pk=instance.pk)
+            .values_list("option_group_id__product_id__restaurant_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    invalidate_menus(getattr(instance, "_restaurant_before", None), instance.restaurant_id_id)
+
+
+@receiver(post_save, sender=OptionGroups)
+@receiver(post_delete, sender=OptionGroups)
+def option_group_changed(sender, instance, **kwargs):
+    invalidate_menus(
+        getattr(instance, "_restaurant_before", None), group_restaurant(instance.product_id_id)
+    )
+
+
+@receiver(post_save, sender=Options)
+@receiver(post_delete, sender=Options)
+def option_changed(sender, instance, **kwargs):
+    invalidate_menus(
+        getattr(instance, "_restaurant_before", None), option_restaurant(instance.option_group_id_id)
+    )
+
+
+@receiver(pre_save, sender=RestaurantReview)
+def review_loading(sender, instance, **kwargs):
+    instance._rating_before = None
+    if instance.pk is not None:
+        instance._rating_before = (
+            RestaurantReview.objects.filter(pk=instance.pk)
+            .values_list("restaurant_id", "rating")
+            .first()
+        )
+
+
+@receiver(post_save, sender=RestaurantReview)
+def review_saved(sender, instance, **kwargs):
+    review_changed(
+        getattr(instance, "_rating_before", None),
+        (instance.restaurant_id_id, instance.rating),
+    )
+
+
+@receiver(post_delete, sender=RestaurantReview)
+def review_deleted(sender, instance, **kwargs):
+    review_changed((instance.restaurant_id_id, instance.rating), None)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # After commit, like the menus: an earlier refill would cache the old row again.
+    transaction.on_commit(partial(user_cache.invalidate, instance.pk))
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=FoodCategory)
+def searchable_saved(sender, instance, **kwargs):
+    index_object(instance)
+
+
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=FoodCategory)
+def searchable_deleted(sender, instance, **kwargs):
+    unindex_object(instance)
+
+
+@receiver(pre_save, sender=RestaurantCategory)
+def restaurant_category_loading(sender, instance, **kwargs):
+    instance._membership_before = None
+    if instance.pk is not None:
+        instance._membership_before = (
+            RestaurantCategory.objects.filter(pk=instance.pk)
+            .values_list("food_category_id", "restaurant_id")
+            .first()
+        )
+
+
+# After commit, like the geo index: a rolled-back membership must not stay in the
+# bitsets, and other workers reloading on the bump must already see the row.
+@receiver(post_save, sender=RestaurantCategory)
+def restaurant_category_saved(sender, instance, **kwargs):
+    before = getattr(instance, "_membership_before", None)
+    if before is not None:
+        transaction.on_commit(partial(category_index.remove, *before))
+    transaction.on_commit(
+        partial(category_index.add, instance.food_category_id_id, instance.restaurant_id_id)
+    )
+
+
+@receiver(post_delete, sender=RestaurantCategory)
+def restaurant_category_deleted(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(category_index.remove, instance.food_category_id_id, instance.restaurant_id_id)
+    )
+
+
+@receiver(post_init, sender=Order)
+def order_loaded(sender, instance, **kwargs):
+    instance._status_before = instance.__dict__.get("status_id")
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, **kwargs):
+    if not created:
+        rollup_status_change([instance.pk], instance._status_before, instance.status_id)
+    if created or instance.status_id != instance._status_before:
+        publish_status(instance.pk, instance.status_id)
+    if created:
+        publish_new_order(instance.restaurant_id_id, instance.pk)
+    instance._status_before = instance.status_id
+
+
+@receiver(pre_delete, sender=Order)
+def order_deleting(sender, instance, **kwargs):
+    # Before the collector deletes the items the product rollups are computed from.
+    if instance.status_id is None or instance.status_id != cancelled_status_id():
+        retract_orders([instance.pk])
+
+
+# After commit: a worker reloading on an earlier bump would keep the old rows
+# under the new version.
+@receiver(post_save, sender=Roles)
+@receiver(post_delete, sender=Roles)
+def role_changed(sender, **kwargs):
+    transaction.on_commit(roles.refresh)
+
+
+@receiver(post_save, sender=OrderStatus)
+@receiver(post_delete, sender=OrderStatus)
+def order_status_changed(sender, **kwargs):
+    transaction.on_commit(order_statuses.refresh)
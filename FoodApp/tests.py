@@ -1,3 +1,1256 @@
-from django.test import TestCase
+import asyncio
+import base64
+import os
+import re
+import runpy
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import timedelta
+from functools import partial
+from io import StringIO
+from decimal import Decimal
+from itertools import count
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, OperationalError, connection, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .admin import EstimatedCountPaginator
+from .management.commands.explain_hot_queries import FULL_SCAN, hot_queries, prefer_indexes
+from .middleware import STICKY_COOKIE, RequestMetricsMiddleware
+from .models import (
+    Address,
+    FoodCategory,
+    OptionGroups,
+    Options,
+    Order,
+    OrderItemOptions,
+    OrderStatus,
+    Product,
+    ProductDailyRollup,
+    Restaurant,
+    RestaurantCategory,
+    RestaurantHourlyRollup,
+    RestaurantReview,
+    Roles,
+    SearchEntry,
+    User,
+)
+from .routers import replica_aliases, routing_scope
+from .services import exports, geohash, user_import
+from .services.analytics import rebuild_rollups
+from .services.archive import archive_batch
+from .services.category_index import category_index, iter_ids
+from .services.geo_index import geo_index
+from .services.menu_cache import get_menu_json, menu_version
+from .services.metrics import request_metrics
+from .services.order_events import get_broker, order_channel
+from .services.kitchen import advance_orders, claim_orders
+from .services.reference_data import (
+    CANCELLED_STATUS,
+    DEFAULT_ROLE,
+    IN_PROGRESS_STATUS,
+    PENDING_STATUS,
+    ReferenceDataMissing,
+    order_statuses,
+    roles,
+    warm_reference_data,
+)
+from .serializers.user_serializers import UserSerializer
+from .services.user_cache import LocalLRU, user_cache
+from .views.user_views import BULK_MAX_ROWS
+
+_sequence = count(1)
+
+
+def make_user(**fields):
+    n = next(_sequence)
+    fields.setdefault("username", f"user{n}")
+    fields.setdefault("email", f"user{n}@example.com")
+    fields.setdefault("phone", "11999999999")
+    fields.setdefault("password_hash", "x")
+    return User.objects.create(**fields)
+
+
+def make_restaurant(**fields):
+    n = next(_sequence)
+    fields.setdefault("name", f"Restaurante {n}")
+    fields.setdefault("cnpj", f"{n:014d}")
+    if "owner_id" not in fields:
+        fields["owner_id"] = make_user()
+    return Restaurant.objects.create(**fields)
+
+
+def make_orders(restaurant, number, status=None, total_price=Decimal("10.00")):
+    return Order.objects.bulk_create(
+        Order(user_id=restaurant.owner_id, restaurant_id=restaurant, status=status, total_price=total_price)
+        for _ in range(number)
+    )
+
+
+class QueryCounter(ExitStack):
+    """Queries per database alias run inside the block."""
+
+    def __enter__(self):
+        super().__enter__()
+        self.captured = {
+            alias: self.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in connections
+        }
+        return self
+
+    def __getitem__(self, alias):
+        return len(self.captured[alias])
+
+
+class RestaurantExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant()
+        make_orders(cls.restaurant, 12, OrderStatus.objects.create(name=PENDING_STATUS))
+        cls.url = f"/restaurants/{cls.restaurant.id}/export/orders.jsonl"
+
+    def test_sync_export(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.is_async)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 12)
+
+    async def test_async_export_streams_one_chunk_at_a_time(self):
+        with (
+            mock.patch.object(exports, "EXPORT_CHUNK_SIZE", 4),
+            mock.patch.object(exports, "EXPORT_BUFFER_SIZE", 1),
+            mock.patch.object(exports, "_with_items", wraps=exports._with_items) as with_items,
+        ):
+            response = await self.async_client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_async)
+            blocks = aiter(response.streaming_content)
+            first = await anext(blocks)
+            # Only the first chunk of orders has been read when the first block goes out.
+            self.assertEqual(with_items.call_count, 1)
+            rest = [block async for block in blocks]
+            self.assertEqual(with_items.call_count, 3)
+        self.assertEqual(len(b"".join([first, *rest]).splitlines()), 12)
+
+
+def make_address(**fields):
+    fields.setdefault("street", "Rua Augusta")
+    fields.setdefault("number", "100")
+    fields.setdefault("complement", "")
+    fields.setdefault("neighborhood", "Consolação")
+    fields.setdefault("city", "São Paulo")
+    fields.setdefault("state", "SP")
+    fields.setdefault("zip_code", "01305-000")
+    return Address.objects.create(**fields)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant()
+        cls.reviews = RestaurantReview.objects.bulk_create(
+            RestaurantReview(restaurant_id=cls.restaurant, user_id=cls.restaurant.owner_id, rating=5)
+            for _ in range(7)
+        )
+        cls.url = f"/restaurants/{cls.restaurant.id}/reviews"
+
+    def pages(self, url, **params):
+        ids, pages = [], 0
+        response = self.client.get(url, {"page_size": 2, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids += [row["id"] for row in response.json()["results"]]
+            pages += 1
+            if response.json()["next"] is None:
+                return ids, pages
+            response = self.client.get(response.json()["next"])
+
+    def test_cursor_round_trip(self):
+        base = timezone.now()
+        for index, review in enumerate(self.reviews):
+            RestaurantReview.objects.filter(pk=review.pk).update(created_at=base + timedelta(minutes=index))
+        expected = [review.id for review in reversed(self.reviews)]
+        self.assertEqual(self.pages(self.url), (expected, 4))
+
+    def test_ties_on_created_at(self):
+        RestaurantReview.objects.update(created_at=timezone.now())
+        ids, _ = self.pages(self.url)
+        self.assertEqual(ids, sorted((review.id for review in self.reviews), reverse=True))
+
+    def test_invalid_cursor(self):
+        tampered = [
+            "not-a-cursor",
+            base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+            base64.urlsafe_b64encode(b'{"id": 1}').decode(),
+            base64.urlsafe_b64encode(b'["2026-01-01T00:00:00Z", null]').decode(),
+        ]
+        for cursor in tampered:
+            with self.subTest(cursor):
+                response = self.client.get(self.url, {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_ordering_by_rating(self):
+        ratings = [4.5, 3.0, 4.5, 5.0, 1.0]
+        restaurants = [make_restaurant() for _ in ratings]
+        for restaurant, rating in zip(restaurants, ratings):
+            Restaurant.objects.filter(pk=restaurant.pk).update(rating_avg=rating)
+        Restaurant.objects.filter(pk=self.restaurant.pk).update(rating_avg=0)
+        ids, _ = self.pages("/restaurants", ordering="rating")
+        expected = sorted(
+            [(rating, restaurant.id) for restaurant, rating in zip(restaurants, ratings)]
+            + [(0, self.restaurant.id)],
+            reverse=True,
+        )
+        self.assertEqual(ids, [restaurant_id for _, restaurant_id in expected])
+
+    def test_live_orders_then_archived_ones(self):
+        orders = make_orders(self.restaurant, 5)
+        base = timezone.now() - timedelta(days=1)
+        for index, order in enumerate(orders):
+            Order.objects.filter(pk=order.pk).update(created_at=base + timedelta(minutes=index))
+        # The two oldest move to the archive; a page straddles both tables.
+        self.assertEqual(archive_batch(base + timedelta(minutes=2)), 2)
+        ids, pages = self.pages(f"/user/{self.restaurant.owner_id.id}/orders")
+        self.assertEqual(ids, [order.id for order in reversed(orders)])
+        self.assertEqual(pages, 3)
+
+
+class GeoIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_customer_addresses_leave_the_index_alone(self):
+        version = geo_index.version.get()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            make_address(user_id=self.restaurant.owner_id, latitude=Decimal("-23.55"), longitude=Decimal("-46.65"))
+        self.assertEqual(callbacks, [])
+        self.assertEqual(geo_index.version.get(), version)
+
+    def test_restaurant_addresses_update_the_index_after_commit(self):
+        version = geo_index.version.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            address = make_address(
+                restaurant_id=self.restaurant, latitude=Decimal("-23.55"), longitude=Decimal("-46.65")
+            )
+            self.assertEqual(geo_index.version.get(), version)
+        self.assertGreater(geo_index.version.get(), version)
+        self.assertEqual([rid for rid, _ in geo_index.nearby(-23.55, -46.65, 1, 10)], [self.restaurant.id])
+
+        # Handing the address over to a customer still updates the index.
+        address.restaurant_id = None
+        address.user_id = self.restaurant.owner_id
+        with self.captureOnCommitCallbacks(execute=True):
+            address.save()
+        self.assertEqual(geo_index.nearby(-23.55, -46.65, 1, 10), [])
+
+    def test_bounding_boxes_wrap_at_the_antimeridian(self):
+        self.assertEqual(len(geohash.bounding_boxes(-17.0, 178.0, 5)), 1)
+        east, west = geohash.bounding_boxes(-17.0, 179.99, 5)
+        self.assertEqual((east[1] < 179.99, east[3]), (True, 180.0))
+        self.assertEqual((west[1], west[3] > -180.0), (-180.0, True))
+        # A circle over the pole spans every longitude.
+        [(_, min_lng, max_lat, max_lng)] = geohash.bounding_boxes(89.99, 10.0, 5)
+        self.assertEqual((min_lng, max_lat, max_lng), (-180.0, 90.0, 180.0))
+
+    def test_nearby_across_the_antimeridian(self):
+        other = make_restaurant()
+        make_address(restaurant_id=self.restaurant, latitude=Decimal("-17.000000"), longitude=Decimal("179.990000"))
+        make_address(restaurant_id=other, latitude=Decimal("-17.000000"), longitude=Decimal("-179.990000"))
+        for in_memory in (True, False):
+            with self.subTest(in_memory=in_memory), override_settings(GEO_INDEX_IN_MEMORY=in_memory):
+                found = dict(geo_index.nearby(-17.0, 179.995, 5, 10))
+                self.assertEqual(set(found), {self.restaurant.id, other.id})
+                self.assertAlmostEqual(found[other.id], 1.6, delta=0.01)
+
+    def test_nearby_view_ranks_by_distance_within_the_radius(self):
+        # About 0.5, 2 and 8 km north of the search point.
+        restaurants = [make_restaurant() for _ in range(3)]
+        for restaurant, offset in zip(restaurants, ("0.004500", "0.018000", "0.072000")):
+            make_address(
+                restaurant_id=restaurant,
+                latitude=Decimal("-23.550000") + Decimal(offset),
+                longitude=Decimal("-46.650000"),
+            )
+        response = self.client.get("/restaurants/nearby", {"lat": -23.55, "lng": -46.65, "radius": 5})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual([row["id"] for row in results], [restaurants[0].id, restaurants[1].id])
+        self.assertAlmostEqual(results[0]["distance_km"], 0.5, delta=0.01)
+        self.assertAlmostEqual(results[1]["distance_km"], 2.0, delta=0.01)
+
+        response = self.client.get(
+            "/restaurants/nearby", {"lat": -23.55, "lng": -46.65, "radius": 10, "limit": 2}
+        )
+        self.assertEqual([row["id"] for row in response.json()], [restaurants[0].id, restaurants[1].id])
+        response = self.client.get("/restaurants/nearby", {"lat": -23.55, "lng": -46.65, "radius": 10})
+        self.assertEqual(len(response.json()), 3)
+
+
+class RestaurantRatingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant()
+
+    def test_rating_must_be_between_1_and_5(self):
+        with self.assertRaises(IntegrityError):
+            RestaurantReview.objects.create(
+                restaurant_id=self.restaurant, user_id=self.restaurant.owner_id, rating=6
+            )
+
+    def test_full_save_keeps_the_counters(self):
+        stale = Restaurant.objects.get(pk=self.restaurant.pk)
+        RestaurantReview.objects.create(
+            restaurant_id=self.restaurant, user_id=self.restaurant.owner_id, rating=4
+        )
+        stale.name = "Renomeado"
+        stale.save()
+        restaurant = Restaurant.objects.get(pk=self.restaurant.pk)
+        self.assertEqual(restaurant.name, "Renomeado")
+        self.assertEqual((restaurant.rating_count, restaurant.rating_sum, restaurant.rating_4_count), (1, 4, 1))
+
+
+class CategoryRestaurantsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = FoodCategory.objects.create(name="Pizza")
+        cls.restaurants = [make_restaurant() for _ in range(3)]
+        RestaurantCategory.objects.bulk_create(
+            RestaurantCategory(restaurant_id=restaurant, food_category_id=cls.category)
+            for restaurant in cls.restaurants
+        )
+        cls.url = f"/categories/{cls.category.id}/restaurants"
+
+    def setUp(self):
+        # bulk_create sends no signals; reload the index from the rows.
+        cache.clear()
+
+    def test_iter_ids_after(self):
+        bits = 0b101101
+        self.assertEqual(list(iter_ids(bits)), [0, 2, 3, 5])
+        self.assertEqual(list(iter_ids(bits, after=2)), [3, 5])
+        self.assertEqual(list(iter_ids(bits, after=10**18)), [])
+        with self.assertRaises(ValueError):
+            list(iter_ids(bits, after=-2))
+
+    def test_pages_with_after(self):
+        ids = [restaurant.id for restaurant in self.restaurants]
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual([row["id"] for row in response.json()["results"]], ids[:2])
+        self.assertEqual(response.json()["next_after"], ids[1])
+        response = self.client.get(self.url, {"after": ids[1]})
+        self.assertEqual([row["id"] for row in response.json()["results"]], ids[2:])
+
+    def test_negative_after_is_rejected(self):
+        response = self.client.get(self.url, {"after": -2})
+        self.assertEqual(response.status_code, 400)
+
+    def test_huge_after_is_empty(self):
+        response = self.client.get(self.url, {"after": 10**18})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+
+
+class CategoryIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.pizza = FoodCategory.objects.create(name="Pizza")
+        cls.vegan = FoodCategory.objects.create(name="Vegana")
+        cls.restaurants = [make_restaurant() for _ in range(3)]
+
+    def setUp(self):
+        cache.clear()
+
+    def members(self, *category_ids):
+        return list(iter_ids(category_index.intersection(category_ids)))
+
+    def test_add_move_and_remove_after_commit(self):
+        restaurant = self.restaurants[0]
+        self.assertEqual(self.members(self.pizza.id), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            membership = RestaurantCategory.objects.create(
+                restaurant_id=restaurant, food_category_id=self.pizza
+            )
+            self.assertEqual(self.members(self.pizza.id), [])
+        self.assertEqual(self.members(self.pizza.id), [restaurant.id])
+
+        membership.food_category_id = self.vegan
+        with self.captureOnCommitCallbacks(execute=True):
+            membership.save()
+        self.assertEqual(self.members(self.pizza.id), [])
+        self.assertEqual(self.members(self.vegan.id), [restaurant.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            membership.delete()
+        self.assertEqual(self.members(self.vegan.id), [])
+        self.assertEqual(category_index.counts().get(self.vegan.id, 0), 0)
+
+    def test_rolled_back_membership_is_not_indexed(self):
+        version = category_index.version.get()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                RestaurantCategory.objects.create(
+                    restaurant_id=self.restaurants[0], food_category_id=self.pizza
+                )
+                raise IntegrityError("rollback")
+        self.assertEqual(callbacks, [])
+        self.assertEqual(category_index.version.get(), version)
+        self.assertEqual(self.members(self.pizza.id), [])
+
+    def test_and_intersects_categories(self):
+        both, pizza_only, vegan_only = self.restaurants
+        with self.captureOnCommitCallbacks(execute=True):
+            RestaurantCategory.objects.bulk_create(
+                RestaurantCategory(restaurant_id=restaurant, food_category_id=category)
+                for restaurant, category in (
+                    (both, self.pizza), (both, self.vegan),
+                    (pizza_only, self.pizza), (vegan_only, self.vegan),
+                )
+            )
+        response = self.client.get(f"/categories/{self.pizza.id}/restaurants", {"and": self.vegan.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual([row["id"] for row in response.json()["results"]], [both.id])
+
+        response = self.client.get(
+            f"/categories/{self.pizza.id}/restaurants", {"and": f"{self.vegan.id},{self.vegan.id + 1000}"}
+        )
+        self.assertEqual(response.json()["results"], [])
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant(name="Casa do Açaí")
+        cls.bowl = Product.objects.create(
+            restaurant_id=cls.restaurant, name="Tigela de açaí", base_price=Decimal("18.00")
+        )
+        cls.category = FoodCategory.objects.create(name="Sobremesas")
+
+    def results(self, query):
+        response = self.client.get("/search", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return {(row["type"], row["id"]) for row in response.json()["results"]}
+
+    def test_matching_ignores_accents_and_case(self):
+        self.assertEqual(
+            self.results("ACAI"),
+            {("restaurant", self.restaurant.id), ("product", self.bowl.id)},
+        )
+
+    def test_prefix_matching(self):
+        self.assertEqual(self.results("sobrem"), {("category", self.category.id)})
+        self.assertEqual(self.results("tigela aca"), {("product", self.bowl.id)})
+
+    def test_signals_keep_the_index_in_sync(self):
+        self.bowl.name = "Vitamina de banana"
+        self.bowl.save()
+        self.assertEqual(self.results("acai"), {("restaurant", self.restaurant.id)})
+        self.assertEqual(self.results("banana"), {("product", self.bowl.id)})
+        self.bowl.delete()
+        self.assertEqual(self.results("banana"), set())
+
+    def test_rebuild_search_index_command(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(self.results("acai"), set())
+        out = StringIO()
+        call_command("rebuild_search_index", "--batch-size", "1", stdout=out)
+        self.assertIn(f"{SearchEntry.objects.count()} entradas", out.getvalue())
+        self.assertEqual(
+            self.results("acai"),
+            {("restaurant", self.restaurant.id), ("product", self.bowl.id)},
+        )
+
+
+class RestaurantMenuTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant()
+        cls.url = f"/restaurants/{cls.restaurant.id}/menu"
+
+    def setUp(self):
+        cache.clear()
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(self.url).headers["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_survives_cache_flush(self):
+        etag = self.client.get(self.url).headers["ETag"]
+        Product.objects.create(restaurant_id=self.restaurant, name="Pizza", base_price=Decimal("30.00"))
+        # The menu version counter is lost and starts over.
+        cache.clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([product["name"] for product in response.json()["products"]], ["Pizza"])
+
+
+class MenuInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant()
+        cls.other = make_restaurant()
+
+    def test_menu_is_invalidated_after_commit(self):
+        version = menu_version(self.restaurant.id).get()
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(restaurant_id=self.restaurant, name="Pizza", base_price=Decimal("30.00"))
+            self.assertEqual(menu_version(self.restaurant.id).get(), version)
+        self.assertGreater(menu_version(self.restaurant.id).get(), version)
+
+    def test_moving_a_product_invalidates_both_menus(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                restaurant_id=self.restaurant, name="Pizza", base_price=Decimal("30.00")
+            )
+        versions = [menu_version(self.restaurant.id).get(), menu_version(self.other.id).get()]
+        product.restaurant_id = self.other
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        self.assertGreater(menu_version(self.restaurant.id).get(), versions[0])
+        self.assertGreater(menu_version(self.other.id).get(), versions[1])
+
+
+class UserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Ids are reused between tests; start from an empty per-process LRU.
+        patcher = mock.patch.object(user_cache, "local", LocalLRU(maxsize=100, ttl=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalidated_after_commit(self):
+        user = make_user()
+        self.assertEqual(user_cache.get(user.id).username, user.username)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=user.pk).update(username="renamed")
+            user.refresh_from_db()
+            user.save()
+            self.assertNotEqual(user_cache.get(user.id).username, "renamed")
+        self.assertEqual(user_cache.get(user.id).username, "renamed")
+
+    def test_delete_view_invalidates(self):
+        user = make_user()
+        user_cache.get(user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/user/{user.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(user_cache.get(user.id).is_active)
+
+
+class HotQueryIndexTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        pattern = FULL_SCAN[connection.vendor]
+        with prefer_indexes():
+            for name, queryset in hot_queries().items():
+                with self.subTest(name):
+                    plan = queryset.explain()
+                    self.assertIsNone(pattern.search(plan), plan)
+
+    def test_email_is_unique_ignoring_case(self):
+        make_user(email="Maria@Example.com")
+        with self.assertRaises(IntegrityError):
+            make_user(email="maria@example.com")
+
+
+class EstimatedCountTests(TestCase):
+    @skipUnless(connection.vendor == "sqlite", "reads sqlite_stat1")
+    def test_sqlite_estimate_ignores_partial_indexes(self):
+        table = User._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            # The partial index (active users only) comes first, as it may after ANALYZE.
+            cursor.execute("DELETE FROM sqlite_stat1 WHERE tbl = %s", [table])
+            cursor.execute(
+                "INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (%s, %s, %s), (%s, %s, %s)",
+                [table, "user_active_created_idx", "2 1", table, "user_email_ci_unique", "5 1"],
+            )
+        queryset = User.objects.all()
+        self.assertEqual(EstimatedCountPaginator(queryset, 20).estimate(queryset), 5)
+
+
+class MigrationTests(TransactionTestCase):
+    """Migrate back to ``before``, create rows with the historical models, migrate to ``after``."""
+
+    before = after = None
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+
+class EmailDedupeMigrationTests(MigrationTests):
+    before = [("FoodApp", "0004_restaurant_rating_aggregates")]
+    after = [("FoodApp", "0005_hot_query_indexes")]
+
+    def test_case_variant_emails_are_renamed(self):
+        User = self.migrate(self.before).get_model("FoodApp", "User")
+        fields = {"phone": "11999999999", "password_hash": "x"}
+        first = User.objects.create(username="a", email="Ana@example.com", **fields)
+        second = User.objects.create(username="b", email="ana@example.com", **fields)
+        other = User.objects.create(username="c", email="bia@example.com", **fields)
+
+        User = self.migrate(self.after).get_model("FoodApp", "User")
+        emails = dict(User.objects.values_list("id", "email"))
+        self.assertEqual(emails[first.id], "Ana@example.com")
+        self.assertEqual(emails[second.id], f"ana+duplicate-{second.id}@example.com")
+        self.assertEqual(emails[other.id], "bia@example.com")
+
+
+class RollupBackfillMigrationTests(MigrationTests):
+    before = [("FoodApp", "0007_search_entry")]
+    after = [("FoodApp", "0008_analytics_rollups")]
+
+    def test_cancelled_orders_are_not_backfilled(self):
+        apps = self.migrate(self.before)
+        model = partial(apps.get_model, "FoodApp")
+        owner = model("User").objects.create(
+            username="dona", email="dona@example.com", phone="11999999999", password_hash="x"
+        )
+        restaurant = model("Restaurant").objects.create(name="Cantina", cnpj="1", owner_id=owner)
+        product = model("Product").objects.create(
+            restaurant_id=restaurant, name="Pizza", base_price=Decimal("30.00")
+        )
+        for name, quantity in ((PENDING_STATUS, 1), (CANCELLED_STATUS, 3)):
+            order = model("Order").objects.create(
+                user_id=owner, restaurant_id=restaurant, total_price=Decimal("30.00") * quantity,
+                status=model("OrderStatus").objects.create(name=name),
+            )
+            model("OrderItems").objects.create(
+                order_id=order, product_id=product, quantity=quantity, base_price=Decimal("30.00")
+            )
+
+        apps = self.migrate(self.after)
+        hourly = apps.get_model("FoodApp", "RestaurantHourlyRollup").objects.get()
+        daily = apps.get_model("FoodApp", "ProductDailyRollup").objects.get()
+        self.assertEqual((hourly.order_count, hourly.revenue), (1, Decimal("30.00")))
+        self.assertEqual((daily.quantity, daily.revenue), (1, Decimal("30.00")))
+
+
+class MissingReferenceDataTests(TestCase):
+    """Without the roles/orderStatus fixtures, requests answer 503 instead of 500."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = make_restaurant()
+        cls.product = Product.objects.create(
+            restaurant_id=cls.restaurant, name="Pizza", base_price=Decimal("30.00")
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_order_without_statuses(self):
+        response = self.client.post(
+            "/orders",
+            {
+                "user_id": self.restaurant.owner_id.id,
+                "restaurant_id": self.restaurant.id,
+                "items": [{"product_id": self.product.id, "quantity": 1}],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Pending", response.json()["error"])
+        self.assertFalse(Order.objects.exists())
+
+    def test_kitchen_without_statuses(self):
+        url = f"/restaurants/{self.restaurant.id}/kitchen"
+        self.assertEqual(self.client.get(url, {"device": "tablet"}).status_code, 503)
+        response = self.client.post(
+            f"{url}/advance",
+            {"device": "tablet", "order_ids": [1], "status": "Delivered"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 503)
+
+    def test_new_reference_data_is_visible_after_commit(self):
+        for registry, model, name in (
+            (roles, Roles, DEFAULT_ROLE),
+            (order_statuses, OrderStatus, PENDING_STATUS),
+        ):
+            with self.subTest(model.__name__):
+                with self.assertRaises(ReferenceDataMissing):
+                    registry.get(name=name)
+                version = registry.version.get()
+                with self.captureOnCommitCallbacks(execute=True):
+                    entry = model.objects.create(name=name)
+                    self.assertEqual(registry.version.get(), version)
+                    with self.assertRaises(ReferenceDataMissing):
+                        registry.get(name=name)
+                self.assertEqual(registry.get(name=name).id, entry.id)
+
+    def test_startup_reports_missing_reference_data(self):
+        with self.assertLogs("FoodApp.services.reference_data", "ERROR") as logs:
+            warm_reference_data()
+        self.assertIn("OrderStatus Pending", logs.output[0])
+        self.assertIn("Roles user", logs.output[0])
+
+
+class OrderRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.statuses = {
+            name: OrderStatus.objects.create(name=name)
+            for name in (PENDING_STATUS, IN_PROGRESS_STATUS, "Delivered", "Cancelled")
+        }
+        cls.restaurant = make_restaurant()
+        cls.product = Product.objects.create(
+            restaurant_id=cls.restaurant, name="Pizza", base_price=Decimal("30.00")
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def place_order(self):
+        response = self.client.post(
+            "/orders",
+            {
+                "user_id": self.restaurant.owner_id.id,
+                "restaurant_id": self.restaurant.id,
+                "items": [{"product_id": self.product.id, "quantity": 2}],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return Order.objects.get(pk=response.json()["id"])
+
+    def totals(self):
+        hourly = RestaurantHourlyRollup.objects.get(restaurant_id=self.restaurant)
+        daily = ProductDailyRollup.objects.get(product_id=self.product)
+        return hourly.order_count, hourly.revenue, daily.quantity, daily.revenue
+
+    def test_cancelling_and_restoring_an_order(self):
+        order = self.place_order()
+        self.place_order()
+        self.assertEqual(self.totals(), (2, Decimal("120.00"), 4, Decimal("120.00")))
+
+        order.status = self.statuses["Cancelled"]
+        order.save()
+        self.assertEqual(self.totals(), (1, Decimal("60.00"), 2, Decimal("60.00")))
+        rebuild_rollups()
+        self.assertEqual(self.totals(), (1, Decimal("60.00"), 2, Decimal("60.00")))
+
+        order.status = self.statuses[PENDING_STATUS]
+        order.save()
+        self.assertEqual(self.totals(), (2, Decimal("120.00"), 4, Decimal("120.00")))
+
+    def test_kitchen_cancellation(self):
+        order = self.place_order()
+        self.assertEqual(claim_orders(self.restaurant.id, "tablet", 1), [order.id])
+        advance_orders(self.restaurant.id, "tablet", [order.id], "Cancelled")
+        self.assertEqual(self.totals(), (0, Decimal("0.00"), 0, Decimal("0.00")))
+
+    def test_deleting_an_order(self):
+        order = self.place_order()
+        self.place_order()
+        order.delete()
+        self.assertEqual(self.totals(), (1, Decimal("60.00"), 2, Decimal("60.00")))
+
+    def test_archiving_keeps_orders_counted(self):
+        self.place_order()
+        self.assertEqual(archive_batch(timezone.now() + timedelta(minutes=1)), 1)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self.totals(), (1, Decimal("60.00"), 2, Decimal("60.00")))
+
+
+class OrderPlacementTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        OrderStatus.objects.create(name=PENDING_STATUS)
+        cls.restaurant = make_restaurant()
+        cls.pizza = Product.objects.create(
+            restaurant_id=cls.restaurant, name="Pizza", base_price=Decimal("30.00")
+        )
+        cls.size = OptionGroups.objects.create(
+            product_id=cls.pizza, name="Tamanho", is_required=True, max_selection=1
+        )
+        cls.toppings = OptionGroups.objects.create(
+            product_id=cls.pizza, name="Adicionais", min_selection=0, max_selection=2
+        )
+        cls.large = Options.objects.create(
+            option_group_id=cls.size, name="Grande", extra_price=Decimal("10.00")
+        )
+        cls.small = Options.objects.create(
+            option_group_id=cls.size, name="Pequena", extra_price=Decimal("0.00")
+        )
+        cls.extras = [
+            Options.objects.create(option_group_id=cls.toppings, name=name, extra_price=Decimal("2.00"))
+            for name in ("Bacon", "Catupiry", "Azeitona")
+        ]
+        cls.soda = Product.objects.create(
+            restaurant_id=cls.restaurant, name="Refrigerante", base_price=Decimal("6.00")
+        )
+        other_group = OptionGroups.objects.create(product_id=cls.soda, name="Gelo")
+        cls.ice = Options.objects.create(
+            option_group_id=other_group, name="Com gelo", extra_price=Decimal("0.00")
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def place(self, *items):
+        return self.client.post(
+            "/orders",
+            {
+                "user_id": self.restaurant.owner_id.id,
+                "restaurant_id": self.restaurant.id,
+                "items": list(items),
+            },
+            content_type="application/json",
+        )
+
+    def pizza_item(self, *options, quantity=1):
+        return {"product_id": self.pizza.id, "quantity": quantity, "options": [o.id for o in options]}
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(message, str(response.json()["items"]))
+        self.assertFalse(Order.objects.exists())
+
+    def test_options_are_priced_and_stored(self):
+        response = self.place(self.pizza_item(self.large, *self.extras[:2], quantity=2))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Decimal(response.json()["total_price"]), Decimal("88.00"))
+        self.assertEqual(OrderItemOptions.objects.count(), 3)
+
+    def test_required_group(self):
+        self.assertRejected(self.place(self.pizza_item()), "Tamanho")
+
+    def test_min_and_max_selection(self):
+        self.assertRejected(self.place(self.pizza_item(self.large, self.small)), "no máximo 1")
+        self.assertRejected(self.place(self.pizza_item(self.large, *self.extras)), "no máximo 2")
+
+    def test_option_of_another_product(self):
+        self.assertRejected(self.place(self.pizza_item(self.large, self.ice)), f"Opção {self.ice.id}")
+
+    def test_repeated_option(self):
+        extra = self.extras[0]
+        self.assertRejected(self.place(self.pizza_item(self.large, extra, extra)), "repetidas")
+
+    def test_total_above_the_column_maximum(self):
+        expensive = Product.objects.create(
+            restaurant_id=self.restaurant, name="Banquete", base_price=Decimal("99999999.99")
+        )
+        response = self.place({"product_id": expensive.id, "quantity": 2})
+        self.assertRejected(response, "excede")
+
+    def test_query_count_does_not_grow_with_items(self):
+        self.assertEqual(self.place(self.pizza_item(self.large)).status_code, 201)
+        with CaptureQueriesContext(connection) as single:
+            self.assertEqual(self.place(self.pizza_item(self.large)).status_code, 201)
+        items = [self.pizza_item(self.small, extra) for extra in self.extras]
+        items += [{"product_id": self.soda.id, "quantity": 3, "options": [self.ice.id]}] * 4
+        with self.assertNumQueries(len(single)):
+            self.assertEqual(self.place(*items).status_code, 201)
+
+
+class OrderEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.statuses = {
+            name: OrderStatus.objects.create(name=name)
+            for name in (PENDING_STATUS, IN_PROGRESS_STATUS, "Delivered")
+        }
+        cls.restaurant = make_restaurant()
+        [cls.order] = make_orders(cls.restaurant, 1, cls.statuses[PENDING_STATUS])
+
+    def setUp(self):
+        cache.clear()
+        self.broker = get_broker()
+        patcher = mock.patch.object(self.broker, "publish", wraps=self.broker.publish)
+        self.publish = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def save_order(self, status_name, rollback=False):
+        """Save the order with ``status_name``; returns the on_commit callbacks run."""
+        order = Order.objects.get(pk=self.order.pk)
+        order.status = self.statuses[status_name]
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    order.save()
+                    self.assertEqual(self.publish.call_count, 0)
+                    if rollback:
+                        raise IntegrityError("rollback")
+            except IntegrityError:
+                pass
+        return callbacks
+
+    async def next_message(self, subscription):
+        return await asyncio.wait_for(subscription.get(), 1)
+
+    async def test_status_change_publishes_once_after_commit(self):
+        subscription = self.broker.subscribe(order_channel(self.order.pk))
+        try:
+            await sync_to_async(self.save_order)(IN_PROGRESS_STATUS)
+            self.assertEqual(self.publish.call_count, 1)
+            message = await self.next_message(subscription)
+            self.assertEqual(message["status"], IN_PROGRESS_STATUS)
+            self.assertTrue(subscription.queue.empty())
+        finally:
+            subscription.close()
+
+    async def test_unchanged_status_publishes_nothing(self):
+        await sync_to_async(self.save_order)(PENDING_STATUS)
+        self.assertEqual(self.publish.call_count, 0)
+
+    async def test_rolled_back_change_publishes_nothing(self):
+        callbacks = await sync_to_async(self.save_order)(IN_PROGRESS_STATUS, rollback=True)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.publish.call_count, 0)
+
+    async def test_stream_delivers_to_a_subscribed_client(self):
+        response = await self.async_client.get(f"/orders/{self.order.pk}/events")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = aiter(response.streaming_content)
+        first = await anext(events)
+        self.assertIn(f'"status": "{PENDING_STATUS}"', first.decode())
+        self.assertEqual(self.broker.subscriber_count(), 1)
+
+        await sync_to_async(self.save_order)("Delivered")
+        self.assertIn('"status": "Delivered"', (await anext(events)).decode())
+        # A final status ends the stream and drops the subscription.
+        self.assertEqual([event async for event in events], [])
+        self.assertEqual(self.broker.subscriber_count(), 0)
+
+    async def test_unknown_order(self):
+        response = await self.async_client.get("/orders/0/events")
+        self.assertEqual(response.status_code, 404)
+
+
+class KitchenClaimTests(TransactionTestCase):
+    def setUp(self):
+        self.pending = OrderStatus.objects.create(name=PENDING_STATUS)
+        OrderStatus.objects.create(name=IN_PROGRESS_STATUS)
+        OrderStatus.objects.create(name="Delivered")
+        self.restaurant = make_restaurant()
+
+    def test_concurrent_devices_never_claim_an_order_twice(self):
+        orders = make_orders(self.restaurant, 60, self.pending)
+
+        def device(name):
+            claimed = []
+            try:
+                while True:
+                    try:
+                        ids = claim_orders(self.restaurant.id, name, 5)
+                    except OperationalError:  # SQLite: the database was locked, retry
+                        continue
+                    if not ids:
+                        return claimed
+                    claimed.extend(ids)
+            finally:
+                connections.close_all()
+
+        names = [f"tablet-{index}" for index in range(4)]
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            claims = dict(zip(names, pool.map(device, names)))
+
+        claimed = Counter(order_id for ids in claims.values() for order_id in ids)
+        self.assertEqual(set(claimed), {order.id for order in orders})
+        self.assertEqual(max(claimed.values()), 1)
+        for name, ids in claims.items():
+            self.assertEqual(
+                set(Order.objects.filter(claimed_by=name).values_list("id", flat=True)), set(ids)
+            )
+
+    def test_advance_skips_orders_held_by_another_device(self):
+        make_orders(self.restaurant, 2, self.pending)
+        mine = claim_orders(self.restaurant.id, "tablet-a", 1)
+        theirs = claim_orders(self.restaurant.id, "tablet-b", 1)
+        done = advance_orders(self.restaurant.id, "tablet-a", mine + theirs, "Delivered")
+        self.assertEqual(done, mine)
+
+
+class RequestMetricsTests(TestCase):
+    SERVER_TIMING = re.compile(
+        r'^db;dur=\d+\.\d\d;desc="(\d+) queries", view;dur=\d+\.\d\d, '
+        r"serialize;dur=\d+\.\d\d, total;dur=\d+\.\d\d$"
+    )
+
+    def setUp(self):
+        request_metrics.reset()
+        self.addCleanup(request_metrics.reset)
+
+    def test_server_timing_header(self):
+        make_restaurant()
+        response = self.client.get("/restaurants")
+        match = self.SERVER_TIMING.match(response.headers["Server-Timing"])
+        self.assertIsNotNone(match, response.headers["Server-Timing"])
+        self.assertGreater(int(match.group(1)), 0)
+
+    def test_metrics_expose_the_counters(self):
+        self.client.get("/restaurants")
+        self.client.get("/restaurants")
+        body = self.client.get("/metrics").content.decode()
+        labels = 'route="restaurants",method="GET"'
+        self.assertIn(f'foodapp_http_requests_total{{{labels},status="200"}} 2', body)
+        self.assertIn(f"foodapp_http_request_duration_seconds_count{{{labels}}} 2", body)
+        self.assertIn(f"foodapp_db_queries_per_request_count{{{labels}}} 2", body)
+        self.assertIn("# TYPE foodapp_user_cache_misses gauge", body)
+
+    def run_queries(self, number):
+        def view(request):
+            for pk in range(number):
+                User.objects.filter(pk=pk).exists()
+            return HttpResponse()
+
+        return RequestMetricsMiddleware(view)(RequestFactory().get("/loop"))
+
+    @override_settings(REQUEST_METRICS_N_PLUS_ONE_THRESHOLD=3)
+    def test_n_plus_one_warning(self):
+        with self.assertLogs("FoodApp.middleware", "WARNING") as logs:
+            self.run_queries(4)
+        self.assertIn("Possible N+1 on GET unmatched: 4 executions", logs.output[0])
+        with self.assertNoLogs("FoodApp.middleware", "WARNING"):
+            self.run_queries(3)
+        self.assertEqual(sum(request_metrics.n_plus_one.values()), 1)
+
+
+class PasswordHasherSettingTests(TestCase):
+    def test_unknown_hasher_is_a_configuration_error(self):
+        with mock.patch.dict(os.environ, {"PASSWORD_HASHER": "md5"}):
+            with self.assertRaises(ImproperlyConfigured):
+                runpy.run_module("config.settings")
+
+
+class SqliteTuningTests(SimpleTestCase):
+    # The test opens its own "default" connection to a scratch file, not the test database.
+    databases = {"default"}
+
+    def test_tuned_profile_is_applied(self):
+        with mock.patch.dict(os.environ, {"SQLITE_TUNING": "1", "DATABASE_URL": "sqlite:///tuned.sqlite3"}):
+            database = runpy.run_module("config.settings")["DATABASES"]["default"]
+        with TemporaryDirectory() as directory:
+            handler = ConnectionHandler({"default": {**database, "NAME": f"{directory}/tuned.sqlite3"}})
+            tuned = handler["default"]
+            try:
+                with tuned.cursor() as cursor:
+                    pragmas = {
+                        name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                        for name in ("journal_mode", "busy_timeout", "synchronous")
+                    }
+                self.assertEqual(pragmas, {"journal_mode": "wal", "busy_timeout": 10000, "synchronous": 1})
+                # atomic() opens transactions with BEGIN <transaction_mode>.
+                self.assertEqual(tuned.transaction_mode, "IMMEDIATE")
+            finally:
+                tuned.close()
+
+
+class UserReadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Roles.objects.create(name=DEFAULT_ROLE)
+        cls.user = make_user(role=cls.role, cpf="52998224725")
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(user_cache, "local", LocalLRU(maxsize=100, ttl=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_matches_the_model_serializer(self):
+        response = self.client.get(f"/user/{self.user.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), UserSerializer(self.user).data)
+
+    async def test_async_get_matches_the_model_serializer(self):
+        response = await self.async_client.get(f"/async/user/{self.user.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), UserSerializer(self.user).data)
+        response = await self.async_client.get("/async/user/0")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_get_reads_through_the_user_cache(self):
+        url = f"/async/user/{self.user.id}"
+        before = user_cache.stats()
+        for _ in range(2):
+            self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        # Another worker: its own empty LRU, the shared cache already filled.
+        with mock.patch.object(user_cache, "local", LocalLRU(maxsize=100, ttl=60)):
+            self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        after = user_cache.stats()
+        self.assertEqual(
+            {name: after[name] - before[name] for name in ("misses", "local_hits", "shared_hits")},
+            {"misses": 1, "local_hits": 1, "shared_hits": 1},
+        )
+
+
+class AsyncUserWriteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Roles.objects.create(name=DEFAULT_ROLE)
+        cls.user = make_user(username="original", phone="11988887777")
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(user_cache, "local", LocalLRU(maxsize=100, ttl=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_create(self):
+        payload = {
+            "username": "assincrono",
+            "email": "Assincrono@Example.com",
+            "phone": "(11) 97777-6666",
+            "password": "assincrono-1",
+            "cpf": "529.982.247-25",
+        }
+        response = await self.async_client.post("/async/user/", payload, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        user = await User.objects.aget(pk=response.json()["id"])
+        self.assertEqual((user.email, user.phone, user.cpf), ("assincrono@example.com", "11977776666", "52998224725"))
+        self.assertTrue(await sync_to_async(check_password)("assincrono-1", user.password_hash))
+
+        response = await self.async_client.post("/async/user/", payload, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json())
+
+    async def test_invalid_json(self):
+        for method, url in (("post", "/async/user/"), ("put", f"/async/user/{self.user.id}")):
+            with self.subTest(method):
+                response = await getattr(self.async_client, method)(url, "{", content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+
+    async def test_unknown_user(self):
+        for method in ("put", "delete"):
+            with self.subTest(method):
+                response = await getattr(self.async_client, method)(
+                    "/async/user/0", {"username": "ninguem", "phone": "11999999999"},
+                    content_type="application/json",
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_update_invalidates_the_cache(self):
+        self.assertEqual(user_cache.get(self.user.id).username, "original")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f"/async/user/{self.user.id}",
+                {"username": "renomeado", "phone": "11988887777"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["username"], "renomeado")
+        self.assertEqual(user_cache.get(self.user.id).username, "renomeado")
+
+    def test_delete_invalidates_the_cache(self):
+        self.assertTrue(user_cache.get(self.user.id).is_active)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/async/user/{self.user.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(user_cache.get(self.user.id).is_active)
+
+
+class BulkUserImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Roles.objects.create(name=DEFAULT_ROLE)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_reported_errors_are_capped(self):
+        valid = {
+            "username": "importado",
+            "email": "importado@example.com",
+            "phone": "11999999999",
+            "password": "importado-1",
+            "cpf": "52998224725",
+        }
+        rows = [{"username": "x"}] * 50 + [valid]
+        # More errors than are reported, while staying under BULK_MAX_ROWS.
+        with mock.patch.object(user_import, "MAX_REPORTED_ERRORS", 20):
+            response = self.client.post("/users/bulk", rows, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        summary = response.json()
+        self.assertEqual(summary["created"], 1)
+        self.assertEqual(summary["failed"], 50)
+        self.assertEqual([error["row"] for error in summary["errors"]], list(range(1, 21)))
+
+    def test_rows_above_the_cap_are_rejected(self):
+        rows = [{"username": "x"}] * (BULK_MAX_ROWS + 1)
+        response = self.client.post("/users/bulk", rows, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(BULK_MAX_ROWS), response.json()["error"])
+
+
+@skipUnless(replica_aliases(), "configure a replica (DATABASE_REPLICA_URLS) to run the routing tests")
+class PrimaryReplicaRoutingTests(TransactionTestCase):
+    """Run with e.g. DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3; in tests the
+    replica mirrors the test database, so only the routing is checked, not lag."""
+
+    databases = {"default", *replica_aliases()}
+
+    def setUp(self):
+        cache.clear()
+        self.replica = replica_aliases()[0]
+
+    def test_cache_fills_read_the_primary(self):
+        user = make_user()
+        restaurant = make_restaurant(owner_id=user)
+        user_cache.invalidate(user.id)
+        cache.clear()
+        # A new request: the writes above do not pin it to the primary.
+        with routing_scope(), QueryCounter() as queries:
+            self.assertEqual(user_cache.get(user.id).id, user.id)
+            self.assertIsNotNone(get_menu_json(restaurant.id))
+        self.assertGreater(queries["default"], 0)
+        self.assertEqual(queries[self.replica], 0)
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        Roles.objects.create(name=DEFAULT_ROLE)
+        with QueryCounter() as queries:
+            response = self.client.post(
+                "/user/",
+                {
+                    "username": "routing",
+                    "email": "routing@example.com",
+                    "phone": "11999999999",
+                    "password": "routing-demo-1",
+                    "cpf": "52998224725",
+                },
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(queries[self.replica], 0)
+
+        # The same client keeps reading from the primary while the cookie lasts.
+        with QueryCounter() as queries:
+            response = self.client.get("/restaurants")
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(queries["default"], 0)
+        self.assertEqual(queries[self.replica], 0)
+
+    def test_reads_without_the_cookie_use_a_replica(self):
+        make_restaurant()
+        with QueryCounter() as queries:
+            response = Client().get("/restaurants")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(queries["default"], 0)
+        self.assertGreater(queries[self.replica], 0)
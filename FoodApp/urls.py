@@ -1,7 +1,44 @@
 from django.urls import path
-from .views.user_views import UserView
+from .views.user_views import UserView, BulkUserView, UserCacheStatsView
+from .views.async_user_views import AsyncUserView
+from .views.order_views import OrderView, UserOrderListView, RestaurantOrderListView
+from .views.order_event_views import OrderEventsView
+from .views.search_views import SearchView
+from .views.category_views import CategoryListView, CategoryRestaurantsView
+from .views.metrics_views import MetricsView
+from .views.kitchen_views import KitchenQueueView, KitchenClaimView, KitchenAdvanceView
+from .views.restaurant_views import (
+    RestaurantListView,
+    RestaurantNearbyView,
+    RestaurantMenuView,
+    RestaurantReviewListView,
+    RestaurantAnalyticsView,
+    RestaurantExportView,
+)
 
 urlpatterns = [
     path('user/<int:user_id>', UserView.as_view()), #Get / Put / Delete
     path('user/', UserView.as_view()), #Post
-]
\ No newline at end of file
+    path('async/user/<int:user_id>', AsyncUserView.as_view()), #Get / Put / Delete (ASGI)
+    path('async/user/', AsyncUserView.as_view()), #Post (ASGI)
+    path('user/cache-stats', UserCacheStatsView.as_view()), #Get
+    path('users/bulk', BulkUserView.as_view()), #Post
+    path('user/<int:user_id>/orders', UserOrderListView.as_view()), #Get ?cursor=
+    path('restaurants', RestaurantListView.as_view()), #Get ?cursor=&min_rating=&ordering=rating
+    path('restaurants/nearby', RestaurantNearbyView.as_view()), #Get ?lat=&lng=&radius=
+    path('restaurants/<int:restaurant_id>/analytics', RestaurantAnalyticsView.as_view()), #Get ?start=&end=
+    path('restaurants/<int:restaurant_id>/export/orders.<str:file_format>', RestaurantExportView.as_view(dataset="orders")), #Get csv|jsonl ?start=&end= (streamed)
+    path('restaurants/<int:restaurant_id>/export/reviews.<str:file_format>', RestaurantExportView.as_view(dataset="reviews")), #Get csv|jsonl ?start=&end= (streamed)
+    path('restaurants/<int:restaurant_id>/kitchen', KitchenQueueView.as_view()), #Get ?device=
+    path('restaurants/<int:restaurant_id>/kitchen/claim', KitchenClaimView.as_view()), #Post (long-poll, ASGI)
+    path('restaurants/<int:restaurant_id>/kitchen/advance', KitchenAdvanceView.as_view()), #Post
+    path('restaurants/<int:restaurant_id>/menu', RestaurantMenuView.as_view()), #Get
+    path('restaurants/<int:restaurant_id>/orders', RestaurantOrderListView.as_view()), #Get ?cursor=&status=
+    path('restaurants/<int:restaurant_id>/reviews', RestaurantReviewListView.as_view()), #Get ?cursor=
+    path('orders', OrderView.as_view()), #Post
+    path('orders/<int:order_id>/events', OrderEventsView.as_view()), #Get (SSE, ASGI)
+    path('search', SearchView.as_view()), #Get ?q=
+    path('categories', CategoryListView.as_view()), #Get
+    path('categories/<int:category_id>/restaurants', CategoryRestaurantsView.as_view()), #Get ?and=2,3&after=&limit=
+    path('metrics', MetricsView.as_view()), #Get (Prometheus text format)
+]
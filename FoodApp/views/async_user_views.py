@@ -0,0 +1,81 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from ..models import User
+from ..serializers.row_serializers import user_rows
+from ..serializers.user_serializers import (
+    UserSerializer,
+    CreateUserSerializer,
+    EditUserSerializer,
+)
+from ..services.passwords import ahash_password
+from ..services.reference_data import DEFAULT_ROLE, ReferenceDataMissing, roles
+from ..services.user_cache import user_cache
+from .utils import parse_body
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncUserView(View):
+    async def get(self, request, user_id=None):
+        if user_id is None:
+            return JsonResponse(
+                {"message": "Para buscar um usuário, use GET /async/user/<id>"}, status=200
+            )
+        try:
+            user = await user_cache.aget(user_id)
+        except User.DoesNotExist:
+            return JsonResponse({"error": "User not found"}, status=404)
+        return JsonResponse(user_rows.to_representation(user_rows.instance_row(user)), status=200)
+
+    async def post(self, request, user_id=None):
+        data = parse_body(request)
+        if data is None:
+            return JsonResponse({"error": "JSON inválido"}, status=400)
+        serializer = CreateUserSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=400)
+
+        validated_data = dict(serializer.validated_data)
+        validated_data["password_hash"] = await ahash_password(validated_data.pop("password"))
+        try:
+            validated_data["role_id"] = (await sync_to_async(roles.get)(name=DEFAULT_ROLE)).id
+        except ReferenceDataMissing as error:
+            return JsonResponse({"error": str(error)}, status=503)
+        user = await User.objects.acreate(**validated_data)
+        return JsonResponse(UserSerializer(user).data, status=201)
+
+    async def put(self, request, user_id=None):
+        try:
+            user = await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            return JsonResponse({"error": "User not found"}, status=404)
+        data = parse_body(request)
+        if data is None:
+            return JsonResponse({"error": "JSON inválido"}, status=400)
+        serializer = EditUserSerializer(instance=user, data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=400)
+
+        validated_data = serializer.validated_data
+        user.username = validated_data.get("username", user.username)
+        user.phone = validated_data.get("phone", user.phone)
+        update_fields = ["username", "phone", "updated_at"]
+        if validated_data.get("password"):
+            user.password_hash = await ahash_password(validated_data["password"])
+            update_fields.append("password_hash")
+        user.updated_at = timezone.now()
+        await user.asave(update_fields=update_fields)
+        return JsonResponse(UserSerializer(user).data, status=200)
+
+    async def delete(self, request, user_id=None):
+        try:
+            user = await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            return JsonResponse({"error": "User not found"}, status=404)
+        user.is_active = False
+        await user.asave(update_fields=["is_active", "updated_at"])
+        return JsonResponse({"message": "Usuario deletado com sucesso"}, status=200)
@@ -0,0 +1,59 @@
+from itertools import islice
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from ..models import FoodCategory, Restaurant
+from ..serializers.category_serializers import FoodCategorySerializer
+from ..serializers.row_serializers import restaurant_rows
+from ..services.category_index import category_index, iter_ids
+
+MAX_PAGE_SIZE = 100
+
+
+def parse_ids(value):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+class CategoryListView(APIView):
+    def get(self, request):
+        counts = category_index.counts()
+        categories = FoodCategorySerializer(FoodCategory.objects.order_by("name"), many=True).data
+        for category in categories:
+            category["restaurant_count"] = counts.get(category["id"], 0)
+        return Response(categories, status=status.HTTP_200_OK)
+
+
+class CategoryRestaurantsView(APIView):
+    def get(self, request, category_id):
+        try:
+            category_ids = [category_id, *parse_ids(request.query_params.get("and", ""))]
+            after = request.query_params.get("after")
+            after = int(after) if after else None
+            if after is not None and after < 0:
+                raise ValueError(after)
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return Response(
+                {"error": "Parâmetros inválidos"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        bits = category_index.intersection(category_ids)
+        ids = list(islice(iter_ids(bits, after), limit + 1))
+        has_next = len(ids) > limit
+        ids = ids[:limit]
+        restaurants = {
+            row["id"]: row
+            for row in restaurant_rows.values(Restaurant.objects.filter(id__in=ids))
+        }
+        return Response(
+            {
+                "count": bits.bit_count(),
+                "next_after": ids[-1] if has_next else None,
+                "results": restaurant_rows.many(
+                    restaurants[restaurant_id] for restaurant_id in ids if restaurant_id in restaurants
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,86 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..models import Restaurant
+from ..serializers.order_serializers import KitchenAdvanceSerializer, KitchenClaimSerializer
+from ..services.kitchen import advance_orders, claim_orders, kitchen_orders, kitchen_snapshot
+from ..services.order_events import get_broker, kitchen_channel
+from ..services.reference_data import ReferenceDataMissing
+from .utils import parse_body
+
+
+class KitchenQueueView(APIView):
+    def get(self, request, restaurant_id):
+        device = request.query_params.get("device")
+        if not device:
+            return Response({"error": "Informe o device"}, status=status.HTTP_400_BAD_REQUEST)
+        if not Restaurant.objects.filter(id=restaurant_id).exists():
+            return Response({"error": "Restaurant not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            snapshot = kitchen_snapshot(restaurant_id, device)
+        except ReferenceDataMissing as error:
+            return Response({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(snapshot, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class KitchenClaimView(View):
+    async def post(self, request, restaurant_id):
+        data = parse_body(request)
+        if data is None:
+            return JsonResponse({"error": "JSON inválido"}, status=400)
+        serializer = KitchenClaimSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+        params = serializer.validated_data
+        if not await Restaurant.objects.filter(id=restaurant_id).aexists():
+            return JsonResponse({"error": "Restaurant not found"}, status=404)
+
+        # Subscribe before the first claim so an order placed in between still wakes us;
+        # the periodic re-check covers orders placed on other workers.
+        claim = sync_to_async(claim_orders)
+        subscription = get_broker().subscribe(kitchen_channel(restaurant_id))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + params["wait"]
+        interval = getattr(settings, "KITCHEN_POLL_INTERVAL", 5)
+        try:
+            while True:
+                ids = await claim(restaurant_id, params["device"], params["limit"])
+                remaining = deadline - loop.time()
+                if ids or remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(subscription.get(), min(remaining, interval))
+                except asyncio.TimeoutError:
+                    pass
+        except ReferenceDataMissing as error:
+            return JsonResponse({"error": str(error)}, status=503)
+        finally:
+            subscription.close()
+
+        orders = await sync_to_async(kitchen_orders)(ids)
+        return JsonResponse({"orders": orders}, status=200)
+
+
+class KitchenAdvanceView(APIView):
+    def post(self, request, restaurant_id):
+        serializer = KitchenAdvanceSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        try:
+            updated = advance_orders(
+                restaurant_id, params["device"], params["order_ids"], params["status"]
+            )
+        except ReferenceDataMissing as error:
+            return Response({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
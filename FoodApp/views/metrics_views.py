@@ -0,0 +1,16 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from ..services.metrics import request_metrics
+from ..services.user_cache import user_cache
+
+
+class MetricsView(APIView):
+    def get(self, request):
+        gauges = [
+            (f"foodapp_user_cache_{name}", f"User cache {name.replace('_', ' ')}.", value)
+            for name, value in user_cache.stats().items()
+        ]
+        return HttpResponse(
+            request_metrics.render(gauges), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
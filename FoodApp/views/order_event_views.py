@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+
+from ..models import Order
+from ..services.order_events import get_broker, order_channel, status_message
+from ..services.reference_data import FINAL_STATUSES
+
+
+def sse(message):
+    return f"event: status\ndata: {json.dumps(message)}\n\n"
+
+
+class OrderEventsView(View):
+    async def get(self, request, order_id):
+        if not await Order.objects.filter(id=order_id).aexists():
+            return JsonResponse({"error": "Order not found"}, status=404)
+
+        async def stream():
+            subscription = get_broker().subscribe(order_channel(order_id))
+            heartbeat = getattr(settings, "ORDER_EVENTS_HEARTBEAT", 15)
+            try:
+                current = await Order.objects.filter(id=order_id).values_list("status_id", flat=True).afirst()
+                message = await sync_to_async(status_message)(order_id, current)
+                yield sse(message)
+                while message["status"] not in FINAL_STATUSES:
+                    try:
+                        message = await asyncio.wait_for(subscription.get(), heartbeat)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                        continue
+                    yield sse(message)
+            finally:
+                subscription.close()
+
+        response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
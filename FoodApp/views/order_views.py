@@ -0,0 +1,53 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from ..models import ArchivedOrder, Order
+from ..pagination import KeysetPagination
+from ..serializers.order_serializers import (
+    OrderSerializer,
+    CreateOrderSerializer,
+)
+from ..serializers.row_serializers import order_rows
+from ..services.reference_data import ReferenceDataMissing
+
+
+class OrderView(APIView):
+    def post(self, request):
+        serializer = CreateOrderSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                order = serializer.save()
+            except ReferenceDataMissing as error:
+                return Response({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class UserOrderListView(APIView):
+    def get(self, request, user_id):
+        querysets = [
+            order_rows.values(Order.objects.filter(user_id=user_id)),
+            order_rows.values(ArchivedOrder.objects.filter(user_id=user_id)),
+        ]
+        paginator = KeysetPagination()
+        page = paginator.paginate_querysets(querysets, request, view=self)
+        return paginator.get_paginated_response(order_rows.many(page))
+
+
+class RestaurantOrderListView(APIView):
+    def get(self, request, restaurant_id):
+        querysets = [
+            order_rows.values(Order.objects.filter(restaurant_id=restaurant_id)),
+            order_rows.values(ArchivedOrder.objects.filter(restaurant_id=restaurant_id)),
+        ]
+        status_id = request.query_params.get("status")
+        if status_id:
+            if not status_id.isdigit():
+                return Response(
+                    {"error": "status inválido"}, status=status.HTTP_400_BAD_REQUEST
+                )
+            querysets = [queryset.filter(status_id=int(status_id)) for queryset in querysets]
+        paginator = KeysetPagination()
+        page = paginator.paginate_querysets(querysets, request, view=self)
+        return paginator.get_paginated_response(order_rows.many(page))
@@ -0,0 +1,131 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from ..models import Restaurant, RestaurantReview
+from ..conditional import make_etag, not_modified, with_validators
+from ..pagination import KeysetPagination
+from ..serializers.restaurant_serializers import (
+    NearbyQuerySerializer,
+    AnalyticsQuerySerializer,
+    ExportQuerySerializer,
+)
+from ..serializers.row_serializers import restaurant_rows, review_rows
+from ..services.analytics import restaurant_dashboard
+from ..services.exports import CONTENT_TYPES, aiter_blocks, export_lines
+from ..services.geo_index import geo_index
+from ..services.menu_cache import get_menu_json, menu_version
+
+
+class RestaurantListView(APIView):
+    def get(self, request):
+        queryset = Restaurant.objects.all()
+        min_rating = request.query_params.get("min_rating")
+        if min_rating:
+            try:
+                queryset = queryset.filter(rating_avg__gte=float(min_rating))
+            except ValueError:
+                return Response(
+                    {"error": "min_rating inválido"}, status=status.HTTP_400_BAD_REQUEST
+                )
+        ordering = "rating_avg" if request.query_params.get("ordering") == "rating" else "created_at"
+        paginator = KeysetPagination(ordering_field=ordering)
+        page = paginator.paginate_queryset(restaurant_rows.values(queryset), request, view=self)
+        return paginator.get_paginated_response(restaurant_rows.many(page))
+
+
+class RestaurantReviewListView(APIView):
+    def get(self, request, restaurant_id):
+        queryset = RestaurantReview.objects.filter(restaurant_id=restaurant_id)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(review_rows.values(queryset), request, view=self)
+        return paginator.get_paginated_response(review_rows.many(page))
+
+
+class RestaurantNearbyView(APIView):
+    def get(self, request):
+        query = NearbyQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        ranked = geo_index.nearby(
+            params["lat"], params["lng"], params["radius"], params["limit"]
+        )
+        restaurants = {
+            row["id"]: row
+            for row in restaurant_rows.values(
+                Restaurant.objects.filter(id__in=[restaurant_id for restaurant_id, _ in ranked])
+            )
+        }
+        ranked = [(restaurant_id, distance) for restaurant_id, distance in ranked if restaurant_id in restaurants]
+        rows = restaurant_rows.many(restaurants[restaurant_id] for restaurant_id, _ in ranked)
+        results = [
+            {**row, "distance_km": round(distance, 3)}
+            for row, (_, distance) in zip(rows, ranked)
+        ]
+        return Response(results, status=status.HTTP_200_OK)
+
+
+class RestaurantMenuView(APIView):
+    def get(self, request, restaurant_id):
+        # The menu version is bumped on every product/option change and restarts from
+        # the clock if the cache loses it, so it validates the cached blob without
+        # touching the database.
+        etag = make_etag("menu", restaurant_id, menu_version(restaurant_id).get())
+        unchanged = not_modified(request, etag=etag)
+        if unchanged is not None:
+            return unchanged
+        blob = get_menu_json(restaurant_id)
+        if blob is None:
+            return Response(
+                {"error": "Restaurant not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return with_validators(HttpResponse(blob, content_type="application/json"), etag=etag)
+
+
+class RestaurantAnalyticsView(APIView):
+    def get(self, request, restaurant_id):
+        if not Restaurant.objects.filter(id=restaurant_id).exists():
+            return Response(
+                {"error": "Restaurant not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        return Response(
+            restaurant_dashboard(restaurant_id, params["start"], params["end"]),
+            status=status.HTTP_200_OK,
+        )
+
+
+class RestaurantExportView(APIView):
+    dataset = "orders"
+
+    def get(self, request, restaurant_id, file_format):
+        if file_format not in CONTENT_TYPES:
+            return Response(
+                {"error": f"Formato inválido; use {', '.join(CONTENT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not Restaurant.objects.filter(id=restaurant_id).exists():
+            return Response(
+                {"error": "Restaurant not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        query = ExportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        blocks = export_lines(
+            self.dataset, file_format, restaurant_id, params.get("start"), params.get("end")
+        )
+        if isinstance(request._request, ASGIRequest):
+            blocks = aiter_blocks(blocks)
+        response = StreamingHttpResponse(blocks, content_type=CONTENT_TYPES[file_format])
+        response["Content-Disposition"] = (
+            f'attachment; filename="restaurant-{restaurant_id}-{self.dataset}.{file_format}"'
+        )
+        return response
@@ -0,0 +1,17 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from ..services.search import search
+
+
+class SearchView(APIView):
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), 50)
+        except ValueError:
+            return Response({"error": "limit inválido"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(query) < 2:
+            return Response({"results": []}, status=status.HTTP_200_OK)
+        return Response({"results": search(query, limit)}, status=status.HTTP_200_OK)
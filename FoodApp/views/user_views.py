@@ -1,26 +1,54 @@
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from ..conditional import make_etag, not_modified, with_validators
 from ..models import User
+from ..serializers.row_serializers import user_rows
 from ..serializers.user_serializers import (
     UserSerializer,
     CreateUserSerializer,
     EditUserSerializer,
 )
+from ..services.reference_data import ReferenceDataMissing
+from ..services.user_cache import user_cache
+from ..services.user_import import import_users
+
+# Every valid row costs one password hash (about 0.5 s of CPU with the default
+# PBKDF2 settings) before the response goes out. hash_many spreads them over
+# PASSWORD_HASHING_PROCESSES, so a full request takes roughly
+# BULK_MAX_ROWS * 0.5 s / processes: ~13 s on 4 cores, ~50 s on one. Larger
+# imports belong in `manage.py import_users`, which has no request timeout.
+BULK_MAX_ROWS = 100
 
 
 class UserView(APIView):
     def get(self, request, user_id=None):
         if user_id:
             try:
-                user = User.objects.get(id=user_id)
-                serializer = UserSerializer(user)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                user = user_cache.get(user_id)
             except User.DoesNotExist:
                 return Response(
                     {"error": "User not found"}, status=status.HTTP_404_NOT_FOUND
                 )
+            # Validators come from the cached user, so a 304 costs no query and no
+            # serialization; the media type keeps JSON and MessagePack tags apart.
+            validators = {
+                "etag": make_etag(
+                    "user", user.id, user.updated_at.isoformat(), request.accepted_renderer.media_type
+                ),
+                "last_modified": user.updated_at,
+                "private": True,
+            }
+            unchanged = not_modified(request, **validators)
+            if unchanged is not None:
+                return unchanged
+            data = user_rows.to_representation(user_rows.instance_row(user))
+            return with_validators(Response(data, status=status.HTTP_200_OK), **validators)
         return Response(
             {
                 "message": "Para criar um usuário, use POST. Para buscar um usuário, use GET /user/<id>",
@@ -38,7 +66,10 @@ class UserView(APIView):
     def post(self, request):
         serializer = CreateUserSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
+            try:
+                user = serializer.save()
+            except ReferenceDataMissing as error:
+                return Response({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
             return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -58,14 +89,37 @@ class UserView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, user_id):
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
+        updated = User.objects.filter(id=user_id).update(
+            is_active=False, updated_at=timezone.now()
+        )
+        if not updated:
             return Response(
                 {"error": "User not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        user.is_active = False
-        user.save()
-        return Response({"Usuario deletado com sucesso"}, status=status.HTTP_200_OK)
\ No newline at end of file
+        transaction.on_commit(partial(user_cache.invalidate, user_id))
+        return Response({"Usuario deletado com sucesso"}, status=status.HTTP_200_OK)
+
+
+class BulkUserView(APIView):
+    def post(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"error": "Envie uma lista de usuários."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > BULK_MAX_ROWS:
+            return Response(
+                {"error": f"Máximo de {BULK_MAX_ROWS} usuários por requisição."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            summary = import_users(rows)
+        except ReferenceDataMissing as error:
+            return Response({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(summary, status=status.HTTP_200_OK)
+
+
+
+class UserCacheStatsView(APIView):
+    def get(self, request):
+        return Response(user_cache.stats(), status=status.HTTP_200_OK)
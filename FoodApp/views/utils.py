@@ -0,0 +1,9 @@
+import json
+
+
+def parse_body(request):
+    """JSON body of a plain Django view's request; None when it is not valid JSON."""
+    try:
+        return json.loads(request.body or b"{}")
+    except ValueError:
+        return None
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+from FoodApp.services.reference_data import warm_reference_data  # noqa: E402
+
+warm_reference_data()
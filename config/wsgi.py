@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+from FoodApp.services.reference_data import warm_reference_data  # noqa: E402
+
+warm_reference_data()